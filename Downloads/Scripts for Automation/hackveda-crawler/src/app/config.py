@@ -29,6 +29,8 @@ class DatabaseConfig:
     url: str = "sqlite:///data/crawler.db"
     pool_size: int = 10
     max_overflow: int = 20
+    pool_recycle: int = 3600  # seconds before a pooled connection is replaced
+    max_connections: int = 100  # server-side connection limit
     echo: bool = False
 
 
@@ -41,6 +43,7 @@ class GmailConfig:
     from_name: str = ""
     daily_limit: int = 500
     rate_limit: int = 10  # emails per minute
+    batch_size: int = 20  # messages per batch request (Gmail allows up to 100)
 
 
 @dataclass
@@ -66,6 +69,7 @@ class EmailConfig:
 class AppConfig:
     """Application configuration settings."""
     concurrency: int = 3
+    max_active_crawls: int = 10  # running + queued web crawls before new ones get 429
     log_level: str = "INFO"
     data_retention_days: int = 90
 
@@ -172,6 +176,8 @@ class ConfigManager:
             url=db_data.get('url', 'sqlite:///data/crawler.db'),
             pool_size=db_data.get('pool_size', 10),
             max_overflow=db_data.get('max_overflow', 20),
+            pool_recycle=db_data.get('pool_recycle', 3600),
+            max_connections=db_data.get('max_connections', 100),
             echo=db_data.get('echo', False),
         )
         
@@ -185,6 +191,7 @@ class ConfigManager:
             from_name=gmail_data.get('from_name', ''),
             daily_limit=gmail_data.get('daily_limit', 500),
             rate_limit=gmail_data.get('rate_limit', 10),
+            batch_size=gmail_data.get('batch_size', 20),
         )
         # Override with environment variables
         import os
@@ -205,6 +212,7 @@ class ConfigManager:
         app_data = data.get('app', {})
         app_config = AppConfig(
             concurrency=app_data.get('concurrency', 3),
+            max_active_crawls=app_data.get('max_active_crawls', 10),
             log_level=app_data.get('log_level', 'INFO'),
             data_retention_days=app_data.get('data_retention_days', 90),
         )
@@ -234,6 +242,9 @@ class ConfigManager:
         if config.email.provider == 'gmail_api':
             if not config.email.gmail.from_address:
                 errors.append("gmail.from_address is required for Gmail API")
+            
+            if not 1 <= config.email.gmail.batch_size <= 100:
+                errors.append("gmail.batch_size must be between 1 and 100")
         
         # Validate app config
         if config.app.log_level not in ['DEBUG', 'INFO', 'WARNING', 'ERROR']:
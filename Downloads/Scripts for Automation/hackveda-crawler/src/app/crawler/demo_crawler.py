@@ -3,10 +3,11 @@ Demo Crawler for HackVeda - Generates sample data for testing
 Since Google blocks automated crawling, this creates realistic demo data
 """
 
+import asyncio
 import random
 import time
 from datetime import datetime
-from typing import List
+from typing import Callable, List, Optional
 from dataclasses import dataclass
 
 from .google_serp import SearchResult
@@ -59,34 +60,71 @@ class DemoCrawler:
         for i in range(min(max_results, 10)):  # Limit to 10 for demo
             # Simulate crawling delay
             time.sleep(random.uniform(0.5, 1.5))
-            
-            # Generate realistic data
-            domain = random.choice(self.sample_domains)
-            title = random.choice(self.sample_titles).format(keyword=keyword.title())
-            snippet = random.choice(self.sample_snippets).format(keyword=keyword)
-            
-            result = SearchResult(
-                title=title,
-                url=f"https://{domain}/{keyword.replace(' ', '-').lower()}-{i+1}",
-                snippet=snippet,
-                rank=i + 1,
-                domain=domain,
-                crawl_timestamp=datetime.now(),
-                response_time=random.uniform(0.2, 2.0),
-                result_metadata={
-                    'keyword': keyword,
-                    'search_engine': 'google_demo',
-                    'crawl_mode': 'demo',
-                    'demo': True
-                }
-            )
-            
-            results.append(result)
-            print(f"  ✅ Generated result {i+1}: {title[:50]}...")
+            results.append(self._generate_result(keyword, i))
         
         print(f"🎉 Demo crawl completed! Generated {len(results)} results for '{keyword}'")
         return results
     
+    async def crawl_keyword_async(self, keyword: str, max_results: int = 10) -> List[SearchResult]:
+        """Generate demo search results for a keyword without blocking the event loop."""
+        print(f"🎭 Demo Mode: Generating sample results for '{keyword}'...")
+        
+        results = []
+        
+        for i in range(min(max_results, 10)):  # Limit to 10 for demo
+            # Simulate crawling delay
+            await asyncio.sleep(random.uniform(0.5, 1.5))
+            results.append(self._generate_result(keyword, i))
+        
+        print(f"🎉 Demo crawl completed! Generated {len(results)} results for '{keyword}'")
+        return results
+    
+    async def crawl_keywords_async(self, keywords: List[str], max_results_per_keyword: int = 10,
+                                   concurrency: int = 8,
+                                   on_keyword_done: Optional[Callable[[str, List[SearchResult]], None]] = None
+                                   ) -> List[SearchResult]:
+        """Crawl keywords concurrently, returning all results in keyword order.
+        
+        ``on_keyword_done(keyword, results)`` is called as each keyword finishes.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def crawl_one(keyword: str) -> List[SearchResult]:
+            async with semaphore:
+                results = await self.crawl_keyword_async(keyword, max_results_per_keyword)
+            if on_keyword_done:
+                on_keyword_done(keyword, results)
+            return results
+        
+        batches = await asyncio.gather(*(crawl_one(keyword) for keyword in keywords))
+        return [result for batch in batches for result in batch]
+    
+    def _generate_result(self, keyword: str, i: int) -> SearchResult:
+        """Generate the i-th demo search result for a keyword."""
+        # Generate realistic data
+        domain = random.choice(self.sample_domains)
+        title = random.choice(self.sample_titles).format(keyword=keyword.title())
+        snippet = random.choice(self.sample_snippets).format(keyword=keyword)
+        
+        result = SearchResult(
+            title=title,
+            url=f"https://{domain}/{keyword.replace(' ', '-').lower()}-{i+1}",
+            snippet=snippet,
+            rank=i + 1,
+            domain=domain,
+            crawl_timestamp=datetime.now(),
+            response_time=random.uniform(0.2, 2.0),
+            result_metadata={
+                'keyword': keyword,
+                'search_engine': 'google_demo',
+                'crawl_mode': 'demo',
+                'demo': True
+            }
+        )
+        
+        print(f"  ✅ Generated result {i+1}: {title[:50]}...")
+        return result
+    
     def crawl_keywords(self, keywords: List[str], max_results_per_keyword: int = 10) -> List[SearchResult]:
         """Crawl multiple keywords and return all results."""
         all_results = []
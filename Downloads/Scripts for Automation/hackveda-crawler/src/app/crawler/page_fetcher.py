@@ -5,6 +5,7 @@ Handles fetching page content with proper error handling and rate limiting.
 
 import time
 import logging
+import threading
 from typing import Optional, Dict, Any
 from urllib.parse import urlparse, urljoin
 from dataclasses import dataclass
@@ -47,8 +48,9 @@ class PageFetcher:
             'Connection': 'keep-alive',
         })
         
-        # Rate limiting
+        # Rate limiting, shared by threads fetching through this instance
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()
     
     def fetch_page(self, url: str, retries: int = None) -> Optional[PageContent]:
         """Fetch a single web page with retries."""
@@ -104,14 +106,16 @@ class PageFetcher:
     
     def _apply_rate_limit(self):
         """Apply rate limiting between requests."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        min_delay = self.config.crawler.delay_min
-        if elapsed < min_delay:
-            time.sleep(min_delay - elapsed)
-        
-        self.last_request_time = time.time()
+        # Held while sleeping so concurrent fetches start at least delay_min apart
+        with self._rate_lock:
+            current_time = time.time()
+            elapsed = current_time - self.last_request_time
+            
+            min_delay = self.config.crawler.delay_min
+            if elapsed < min_delay:
+                time.sleep(min_delay - elapsed)
+            
+            self.last_request_time = time.time()
     
     def _parse_page_content(self, response: requests.Response, url: str, response_time: float) -> Optional[PageContent]:
         """Parse page content from HTTP response."""
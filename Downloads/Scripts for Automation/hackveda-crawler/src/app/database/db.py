@@ -8,8 +8,10 @@ from contextlib import contextmanager
 from typing import Generator, Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event, func, insert, text
+from sqlalchemy.orm import sessionmaker, selectinload, Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.pool import StaticPool
 
@@ -17,6 +19,25 @@ from .models import Base, CrawlSession, SearchResult, Domain, Contact, EmailCamp
 from ..config import get_config
 
 
+# WAL lets dashboard reads proceed while a crawl is writing; NORMAL sync is safe under WAL
+_SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply _SQLITE_PRAGMAS to each new file-backed SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 class DatabaseManager:
     """Manages database connections and operations."""
     
@@ -40,24 +61,42 @@ class DatabaseManager:
         }
         
         # SQLite specific configuration
-        if db_url.startswith('sqlite'):
-            engine_kwargs.update({
-                'poolclass': StaticPool,
-                'connect_args': {
-                    'check_same_thread': False,
-                    'timeout': 30
-                }
-            })
+        is_sqlite = db_url.startswith('sqlite')
+        in_memory = is_sqlite and (':memory:' in db_url or db_url.rstrip('/') == 'sqlite:')
+        if is_sqlite:
+            engine_kwargs['connect_args'] = {
+                'check_same_thread': False,
+                'timeout': 30
+            }
+            if in_memory:
+                # An in-memory database lives only as long as its single connection
+                engine_kwargs['poolclass'] = StaticPool
         else:
             # PostgreSQL/MySQL configuration
+            db_config = self.config.database
+            pool_size = db_config.pool_size or 10
+            max_overflow = db_config.max_overflow
+            if max_overflow is None:
+                max_overflow = 20
+            
             engine_kwargs.update({
-                'pool_size': self.config.database.pool_size,
-                'max_overflow': self.config.database.max_overflow,
-                'pool_recycle': 3600,  # Recycle connections every hour
+                'pool_size': pool_size,
+                'max_overflow': max_overflow,
+                'pool_recycle': db_config.pool_recycle or 3600,
             })
+            
+            # Each process can open up to pool_size + max_overflow connections
+            max_connections = db_config.max_connections
+            if max_connections and pool_size + max_overflow > max_connections:
+                self.logger.warning(
+                    f"Connection pool (pool_size={pool_size} + max_overflow={max_overflow}) "
+                    f"exceeds the server limit of {max_connections} connections"
+                )
         
         try:
             self._engine = create_engine(db_url, **engine_kwargs)
+            if is_sqlite and not in_memory:
+                event.listen(self._engine, 'connect', _set_sqlite_pragmas)
             self.logger.info(f"Database engine created successfully: {db_url.split('://')[0]}://...")
             return self._engine
         except Exception as e:
@@ -202,6 +241,13 @@ def get_db_session():
 
 # Repository classes for data access
 
+# Dialect-specific INSERT constructs that support ON CONFLICT upserts
+_UPSERT_INSERTS = {
+    'postgresql': pg_insert,
+    'sqlite': sqlite_insert,
+}
+
+
 class CrawlSessionRepository:
     """Repository for crawl session operations."""
     
@@ -219,9 +265,16 @@ class CrawlSessionRepository:
         self.session.flush()  # Get ID without committing
         return crawl_session
     
-    def get_by_id(self, session_id: int) -> Optional[CrawlSession]:
-        """Get crawl session by ID."""
-        return self.session.query(CrawlSession).filter(
+    def get_by_id(self, session_id: int, eager: bool = False) -> Optional[CrawlSession]:
+        """Get crawl session by ID.
+        
+        With ``eager=True`` the session's search results are loaded in one
+        batched ``IN (...)`` query instead of lazily on first access.
+        """
+        query = self.session.query(CrawlSession)
+        if eager:
+            query = query.options(selectinload(CrawlSession.search_results))
+        return query.filter(
             CrawlSession.id == session_id
         ).first()
     
@@ -245,6 +298,9 @@ class CrawlSessionRepository:
 class SearchResultRepository:
     """Repository for search result operations."""
     
+    # Batches larger than this are inserted with a single executemany INSERT
+    BULK_INSERT_THRESHOLD = 50
+    
     def __init__(self, session: Session):
         self.session = session
     
@@ -258,10 +314,30 @@ class SearchResultRepository:
         return search_result
     
     def bulk_create(self, results: List[Dict[str, Any]]) -> List[SearchResult]:
-        """Create multiple search results efficiently."""
-        search_results = [SearchResult(**result_data) for result_data in results]
-        self.session.add_all(search_results)
-        return search_results
+        """Create multiple search results efficiently.
+        
+        Small batches are added to the session and returned as pending objects.
+        Large batches bypass the unit of work and are sent as one Core
+        ``INSERT ... RETURNING id`` executemany; the returned objects are then
+        transient, read-only copies carrying the generated IDs. They are not
+        attached to the session, so do not ``add()`` or ``merge()`` them: that
+        would insert the rows a second time. Load them with ``session.get``
+        to modify them.
+        """
+        if len(results) <= self.BULK_INSERT_THRESHOLD:
+            search_results = [SearchResult(**result_data) for result_data in results]
+            self.session.add_all(search_results)
+            return search_results
+        
+        ids = self.session.execute(
+            insert(SearchResult).returning(SearchResult.id, sort_by_parameter_order=True),
+            results
+        ).scalars().all()
+        
+        return [
+            SearchResult(id=result_id, **result_data)
+            for result_id, result_data in zip(ids, results)
+        ]
     
     def get_by_domain(self, domain: str) -> List[SearchResult]:
         """Get all results for a specific domain."""
@@ -289,7 +365,27 @@ class DomainRepository:
         self.session = session
     
     def get_or_create(self, domain_name: str) -> Domain:
-        """Get existing domain or create new one."""
+        """Get existing domain or create new one.
+        
+        On PostgreSQL and SQLite this is a single
+        ``INSERT ... ON CONFLICT (domain) DO UPDATE ... RETURNING`` statement,
+        which also avoids duplicate-key races between concurrent crawlers.
+        Other backends fall back to SELECT-then-INSERT.
+        """
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is not None:
+            now = datetime.utcnow()
+            stmt = dialect_insert(Domain).values(
+                domain=domain_name, last_crawled=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['domain'],
+                set_={'crawl_count': Domain.crawl_count + 1, 'last_crawled': now}
+            ).returning(Domain)
+            return self.session.execute(
+                stmt, execution_options={'populate_existing': True}
+            ).scalar_one()
+        
         domain = self.session.query(Domain).filter(
             Domain.domain == domain_name
         ).first()
@@ -344,6 +440,40 @@ class ContactRepository:
         self.session.add(contact)
         return contact
     
+    def bulk_upsert(self, contacts_data: List[Dict[str, Any]]) -> List[Contact]:
+        """Create multiple contacts, skipping ones that already exist.
+        
+        Existing contacts are found with a single ``email IN (...)`` lookup
+        rather than one query per email. Each row needs ``domain_id`` and
+        ``email``; any other keys are passed through to ``Contact``.
+        """
+        if not contacts_data:
+            return []
+        
+        emails = list({row['email'] for row in contacts_data})
+        existing = {
+            (contact.domain_id, contact.email): contact
+            for contact in self.session.query(Contact).filter(
+                Contact.email.in_(emails)
+            ).all()
+        }
+        
+        contacts = []
+        new_contacts = []
+        for row in contacts_data:
+            key = (row['domain_id'], row['email'])
+            contact = existing.get(key)
+            if contact is None:
+                contact = Contact(**row)
+                existing[key] = contact
+                new_contacts.append(contact)
+            contacts.append(contact)
+        
+        if new_contacts:
+            self.session.add_all(new_contacts)
+        
+        return contacts
+    
     def get_by_status(self, status: str) -> List[Contact]:
         """Get contacts by email status."""
         return self.session.query(Contact).filter(
@@ -372,6 +502,11 @@ class EmailLogRepository:
         self.session.add(email_log)
         return email_log
     
+    def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert several email logs in one executemany, without building ORM objects."""
+        if rows:
+            self.session.execute(insert(EmailLog), rows)
+    
     def update_status(self, log_id: int, status: str, **kwargs):
         """Update email log status."""
         email_log = self.session.query(EmailLog).filter(EmailLog.id == log_id).first()
@@ -390,12 +525,15 @@ class EmailLogRepository:
     
     def get_campaign_stats(self, campaign_id: int) -> Dict[str, int]:
         """Get email statistics for a campaign."""
-        logs = self.session.query(EmailLog).filter(
+        # Aggregate in the database so only one row per status is returned
+        status_counts = self.session.query(
+            EmailLog.status, func.count(EmailLog.id)
+        ).filter(
             EmailLog.campaign_id == campaign_id
-        ).all()
+        ).group_by(EmailLog.status).all()
         
         stats = {
-            'total': len(logs),
+            'total': 0,
             'queued': 0,
             'sent': 0,
             'delivered': 0,
@@ -403,8 +541,9 @@ class EmailLogRepository:
             'bounced': 0
         }
         
-        for log in logs:
-            stats[log.status] = stats.get(log.status, 0) + 1
+        for status, count in status_counts:
+            stats[status] = stats.get(status, 0) + count
+            stats['total'] += count
         
         return stats
     
@@ -9,7 +9,7 @@ import json
 
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Float, Boolean, 
-    ForeignKey, JSON, Index, UniqueConstraint
+    ForeignKey, JSON, Index, UniqueConstraint, insert
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, validates
@@ -360,9 +360,15 @@ def create_email_campaign(name: str, template_name: str, subject_template: str,
 
 def log_audit_event(action: str, entity_type: str = None, entity_id: int = None,
                    details: Dict[str, Any] = None, success: bool = True,
-                   error_message: str = None, **kwargs) -> AuditLog:
-    """Create an audit log entry."""
-    return AuditLog(
+                   error_message: str = None, session=None, **kwargs) -> AuditLog:
+    """Create an audit log entry.
+    
+    If a session is given, the entry is written with a single
+    ``INSERT ... RETURNING`` statement and returned detached with its
+    generated ``id`` and ``timestamp``; otherwise an unsaved instance is
+    returned.
+    """
+    values = dict(
         action=action,
         entity_type=entity_type,
         entity_id=entity_id,
@@ -371,3 +377,12 @@ def log_audit_event(action: str, entity_type: str = None, entity_id: int = None,
         error_message=error_message,
         **kwargs
     )
+    
+    if session is None:
+        return AuditLog(**values)
+    
+    row = session.execute(
+        insert(AuditLog).values(**values).returning(AuditLog.id, AuditLog.timestamp)
+    ).one()
+    values['timestamp'] = row.timestamp
+    return AuditLog(id=row.id, **values)
@@ -6,7 +6,7 @@ Provides clean interface for database CRUD operations.
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, insert
 
 from .models import (
     CrawlSession, SearchResult, Domain, Contact, 
@@ -27,6 +27,11 @@ class BaseRepository:
         self.session.flush()  # Get ID without committing
         return instance
     
+    def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert several records in one executemany, without building ORM objects."""
+        if rows:
+            self.session.execute(insert(self.model), rows)
+    
     def get_by_id(self, id: int):
         """Get record by ID."""
         return self.session.query(self.model).filter(self.model.id == id).first()
@@ -99,6 +104,19 @@ class SearchResultRepository(BaseRepository):
             .order_by(SearchResult.rank)\
             .all()
     
+    def get_summaries_by_session(self, session_id: int) -> List[Dict[str, Any]]:
+        """Get title, url, snippet, domain and rank of a session's results.
+        
+        Only those columns are selected and no ORM objects are built.
+        """
+        columns = (SearchResult.title, SearchResult.url, SearchResult.snippet,
+                   SearchResult.domain, SearchResult.rank)
+        rows = self.session.query(*columns)\
+            .filter(SearchResult.crawl_session_id == session_id)\
+            .order_by(SearchResult.rank)\
+            .all()
+        return [row._asdict() for row in rows]
+    
     def get_by_domain(self, domain: str) -> List[SearchResult]:
         """Get results by domain."""
         return self.session.query(SearchResult)\
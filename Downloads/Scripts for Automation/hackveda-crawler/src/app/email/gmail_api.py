@@ -6,6 +6,7 @@ Handles secure email sending through Gmail API with proper authentication and ra
 import os
 import json
 import logging
+import threading
 import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
@@ -26,6 +27,32 @@ from ..config import get_config
 from ..database.models import EmailLog
 
 
+# build() loads and parses the Gmail discovery document, so API clients are
+# shared between GmailService instances. googleapiclient clients are not
+# thread-safe, so each thread keeps its own.
+_gmail_clients = threading.local()
+
+
+def _get_gmail_client(creds):
+    """Return this thread's Gmail API client for creds, building it once."""
+    clients = getattr(_gmail_clients, 'by_key', None)
+    if clients is None:
+        clients = _gmail_clients.by_key = {}
+    
+    refresh_token = getattr(creds, 'refresh_token', None)
+    key = (getattr(creds, 'client_id', None), refresh_token or id(creds))
+    
+    # Without a refresh token the key is an object id, which only identifies
+    # the credentials while that same object is still the one in use
+    cached = clients.get(key)
+    if cached is not None and (refresh_token or cached[0] is creds):
+        return cached[1]
+    
+    service = build('gmail', 'v1', credentials=creds, cache_discovery=False)
+    clients[key] = (creds, service)
+    return service
+
+
 class GmailAuthManager:
     """Manages Gmail OAuth2 authentication and token refresh."""
     
@@ -34,18 +61,38 @@ class GmailAuthManager:
         'https://www.googleapis.com/auth/gmail.readonly'
     ]
     
+    # Cached credentials are reloaded once they are this close to expiry
+    EXPIRY_MARGIN = timedelta(seconds=60)
+    
     def __init__(self, config=None):
         self.config = config or get_config()
         self.logger = logging.getLogger(__name__)
         self.credentials_path = self.config.email.gmail.credentials_path
         self.token_path = self.config.email.gmail.token_path
+        self._cached_creds = None
         
         # Ensure directories exist
         Path(self.credentials_path).parent.mkdir(parents=True, exist_ok=True)
         Path(self.token_path).parent.mkdir(parents=True, exist_ok=True)
     
+    def _has_fresh_cached_credentials(self) -> bool:
+        """Check whether cached credentials can be reused without reloading."""
+        creds = self._cached_creds
+        if not creds or not creds.valid:
+            return False
+        if creds.expiry is None:
+            return True
+        return creds.expiry - datetime.utcnow() > self.EXPIRY_MARGIN
+    
     def get_credentials(self) -> Optional[Credentials]:
-        """Get valid Gmail API credentials."""
+        """Get valid Gmail API credentials.
+        
+        Credentials are cached on the instance, so the token file is only
+        read again when the cached token is about to expire.
+        """
+        if self._has_fresh_cached_credentials():
+            return self._cached_creds
+        
         creds = None
         
         # Load existing token
@@ -73,6 +120,7 @@ class GmailAuthManager:
             if creds:
                 self._save_credentials(creds)
         
+        self._cached_creds = creds
         return creds
     
     def _run_oauth_flow(self) -> Optional[Credentials]:
@@ -112,6 +160,7 @@ class GmailAuthManager:
             creds = self.get_credentials()
             if creds:
                 creds.revoke(Request())
+            self._cached_creds = None
             
             # Delete token file
             if os.path.exists(self.token_path):
@@ -147,21 +196,31 @@ class GmailAuthManager:
 class GmailRateLimiter:
     """Handles Gmail API rate limiting."""
     
+    SECONDS_PER_DAY = 86400
+    
     def __init__(self, daily_limit: int = 500, rate_limit: int = 10):
         self.daily_limit = daily_limit
         self.rate_limit = rate_limit  # emails per minute
         self.sent_today = 0
-        self.last_reset = datetime.now().date()
-        self.last_send_time = 0
+        # Start of the current (UTC) quota day as an epoch timestamp, so the
+        # per-send check is a float comparison instead of building dates
+        now = time.time()
+        self._day_start = now - now % self.SECONDS_PER_DAY
+        self.last_send_time = None
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def last_reset(self):
+        """Date on which the daily counter was last reset."""
+        return datetime.utcfromtimestamp(self._day_start).date()
+    
     def can_send_email(self) -> bool:
         """Check if we can send an email within rate limits."""
         # Reset daily counter if new day
-        today = datetime.now().date()
-        if today > self.last_reset:
+        now = time.time()
+        if now >= self._day_start + self.SECONDS_PER_DAY:
             self.sent_today = 0
-            self.last_reset = today
+            self._day_start = now - now % self.SECONDS_PER_DAY
         
         # Check daily limit
         if self.sent_today >= self.daily_limit:
@@ -170,20 +229,26 @@ class GmailRateLimiter:
         
         return True
     
-    def wait_if_needed(self):
-        """Wait if rate limit requires it."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_send_time
-        
-        # Calculate minimum time between emails (60 seconds / rate_limit)
-        min_interval = 60.0 / self.rate_limit
+    def wait_if_needed(self, count: int = 1):
+        """Wait if rate limit requires it before sending count emails at once.
         
-        if time_since_last < min_interval:
-            wait_time = min_interval - time_since_last
-            self.logger.info(f"Rate limiting: waiting {wait_time:.2f} seconds")
-            time.sleep(wait_time)
+        The wait covers the whole group: count emails need count intervals
+        since the previous send. The group itself still goes out as one
+        burst, so callers keep count at or below rate_limit.
+        """
+        if self.last_send_time is not None:
+            time_since_last = time.monotonic() - self.last_send_time
+            
+            # Calculate minimum time between emails (60 seconds / rate_limit),
+            # scaled by how many are about to go out together
+            min_interval = 60.0 / self.rate_limit * count
+            
+            if time_since_last < min_interval:
+                wait_time = min_interval - time_since_last
+                self.logger.info(f"Rate limiting: waiting {wait_time:.2f} seconds")
+                time.sleep(wait_time)
         
-        self.last_send_time = time.time()
+        self.last_send_time = time.monotonic()
     
     def record_sent_email(self):
         """Record that an email was sent."""
@@ -194,6 +259,9 @@ class GmailRateLimiter:
 class GmailService:
     """Main Gmail service for sending emails."""
     
+    # Gmail accepts at most 100 calls in one batch request
+    BATCH_SIZE = 100
+    
     def __init__(self, config=None):
         self.config = config or get_config()
         self.logger = logging.getLogger(__name__)
@@ -203,6 +271,7 @@ class GmailService:
             rate_limit=self.config.email.gmail.rate_limit
         )
         self._service = None
+        self._template_manager = None
     
     def _get_service(self):
         """Get Gmail API service instance."""
@@ -211,7 +280,7 @@ class GmailService:
             if not creds:
                 raise Exception("Failed to get valid Gmail credentials")
             
-            self._service = build('gmail', 'v1', credentials=creds)
+            self._service = _get_gmail_client(creds)
             self.logger.debug("Gmail service initialized")
         
         return self._service
@@ -270,6 +339,96 @@ class GmailService:
                 'error': error_msg
             }
     
+    def send_emails_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several emails through Gmail batch requests.
+        
+        Each message is a dict of ``send_email`` keyword arguments. Results
+        come back in the same order, each with a ``recipient`` key.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        
+        def on_sent(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None:
+                error_msg = f"Gmail API error: {exception}"
+                self.logger.error(f"{error_msg} (to {messages[index]['to_address']})")
+                results[index] = {
+                    'success': False,
+                    'error': error_msg,
+                    'error_code': exception.resp.status if isinstance(exception, HttpError) else None
+                }
+                return
+            
+            self.rate_limiter.record_sent_email()
+            results[index] = {
+                'success': True,
+                'message_id': response.get('id'),
+                'thread_id': response.get('threadId'),
+                'sent_at': datetime.utcnow().isoformat()
+            }
+        
+        try:
+            service = self._get_service()
+        except Exception as e:
+            error_msg = f"Failed to send email: {e}"
+            self.logger.error(error_msg)
+            return [
+                {'success': False, 'error': error_msg, 'recipient': message['to_address']}
+                for message in messages
+            ]
+        
+        # Smaller batches than Gmail allows avoid bursts of 429 responses.
+        # A batch is delivered as one burst, so it never holds more than a
+        # minute's worth of the per-minute rate limit.
+        batch_size = max(1, min(self.config.email.gmail.batch_size, self.BATCH_SIZE,
+                                self.rate_limiter.rate_limit))
+        for start in range(0, len(messages), batch_size):
+            chunk = range(start, min(start + batch_size, len(messages)))
+            
+            # Only queue what is left of today's quota
+            if self.rate_limiter.can_send_email():
+                remaining = self.rate_limiter.daily_limit - self.rate_limiter.sent_today
+            else:
+                remaining = 0
+            
+            batch = service.new_batch_http_request(callback=on_sent)
+            queued = 0
+            for index in chunk:
+                if queued >= remaining:
+                    results[index] = {'success': False, 'error': 'Daily email limit exceeded'}
+                    continue
+                
+                try:
+                    message = self._create_message(**messages[index])
+                    batch.add(
+                        service.users().messages().send(userId='me', body=message),
+                        request_id=str(index)
+                    )
+                    queued += 1
+                except Exception as e:
+                    results[index] = {'success': False, 'error': f"Failed to send email: {e}"}
+            
+            if not queued:
+                continue
+            
+            self.rate_limiter.wait_if_needed(queued)
+            try:
+                batch.execute()
+            except Exception as e:
+                self.logger.error(f"Gmail batch request failed: {e}")
+                for index in chunk:
+                    if results[index] is None:
+                        results[index] = {'success': False, 'error': f"Failed to send email: {e}"}
+        
+        for index, message in enumerate(messages):
+            if results[index] is None:
+                results[index] = {'success': False, 'error': 'No response for message in Gmail batch'}
+            results[index]['recipient'] = message['to_address']
+        
+        sent = sum(1 for result in results if result['success'])
+        self.logger.info(f"Gmail batch sent {sent}/{len(messages)} emails")
+        return results
+    
     def _create_message(self, to_address: str, subject: str, body: str,
                        html_body: str = None, attachments: List[str] = None,
                        from_name: str = None) -> Dict[str, str]:
@@ -346,7 +505,10 @@ class GmailService:
         """Send email using a template."""
         from .templates import EmailTemplateManager
         
-        template_manager = EmailTemplateManager()
+        # Keep one manager so repeated renders hit its compiled and rendered caches
+        if self._template_manager is None:
+            self._template_manager = EmailTemplateManager()
+        template_manager = self._template_manager
         
         try:
             # Render template
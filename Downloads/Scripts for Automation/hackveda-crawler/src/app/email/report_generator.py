@@ -3,10 +3,18 @@ Email Report Generator for HackVeda Crawler
 Creates beautiful HTML email reports from crawling results
 """
 
+from functools import lru_cache
 from typing import List, Dict, Any
 from datetime import datetime
 from jinja2 import Template
 
+
+@lru_cache(maxsize=4)
+def _compile_template(source: str) -> Template:
+    """Parse and compile a report template once per distinct source string."""
+    return Template(source)
+
+
 class CrawlReportGenerator:
     """Generate beautiful email reports from crawl results."""
     
@@ -285,7 +293,7 @@ class CrawlReportGenerator:
         }
         
         # Generate HTML
-        template = Template(self.html_template)
+        template = _compile_template(self.html_template)
         html_content = template.render(**template_data)
         
         # Generate text version
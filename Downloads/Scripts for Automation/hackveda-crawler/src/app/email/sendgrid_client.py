@@ -8,7 +8,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 import sendgrid
-from sendgrid.helpers.mail import Mail, Email, To, Content, Attachment
+from sendgrid.helpers.mail import Mail, Email, To, Content, Attachment, Personalization
 from python_http_client import exceptions
 
 from ..config import get_config
@@ -17,6 +17,9 @@ from ..config import get_config
 class SendGridClient:
     """SendGrid email client for sending emails."""
     
+    # SendGrid accepts at most 1000 personalizations in one mail/send request
+    MAX_PERSONALIZATIONS = 1000
+    
     def __init__(self):
         self.config = get_config()
         self.logger = logging.getLogger(__name__)
@@ -158,6 +161,77 @@ class SendGridClient:
                 'error': error_msg
             }
     
+    def send_email_to_many(
+        self,
+        to_emails: List[str],
+        subject: str,
+        html_content: str = None,
+        text_content: str = None,
+        from_email: str = None,
+        from_name: str = None,
+        subjects: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Send the same email to several recipients in one API call.
+        
+        Each recipient gets its own personalization, so nobody sees the other
+        addresses. ``subjects``, parallel to ``to_emails``, overrides the subject
+        per recipient. Results come back per recipient, in order, each with a
+        ``recipient`` key.
+        """
+        def for_all(result: Dict[str, Any], recipients: List[str]) -> List[Dict[str, Any]]:
+            return [dict(result, recipient=to_email) for to_email in recipients]
+        
+        if not self.is_available():
+            return for_all({'success': False, 'error': 'SendGrid client not available'}, to_emails)
+        
+        if not html_content and not text_content:
+            return for_all({'success': False, 'error': 'No email content provided'}, to_emails)
+        
+        # Set default sender
+        if not from_email:
+            from_email = self.config.email.from_email
+        if not from_name:
+            from_name = self.config.email.from_name or "HackVeda Crawler"
+        
+        results = []
+        for start in range(0, len(to_emails), self.MAX_PERSONALIZATIONS):
+            chunk = to_emails[start:start + self.MAX_PERSONALIZATIONS]
+            try:
+                mail = Mail(from_email=Email(from_email, from_name), subject=subject)
+                for offset, to_email in enumerate(chunk):
+                    personalization = Personalization()
+                    personalization.add_to(To(to_email))
+                    if subjects:
+                        personalization.subject = subjects[start + offset]
+                    mail.add_personalization(personalization)
+                
+                if html_content:
+                    mail.add_content(Content("text/html", html_content))
+                if text_content:
+                    mail.add_content(Content("text/plain", text_content))
+                
+                response = self._client.send(mail)
+                
+                self.logger.info(f"Email sent successfully to {len(chunk)} recipients")
+                
+                results.extend(for_all({
+                    'success': True,
+                    'message_id': response.headers.get('X-Message-Id'),
+                    'status_code': response.status_code,
+                    'sent_at': datetime.utcnow().isoformat()
+                }, chunk))
+                
+            except exceptions.BadRequestsError as e:
+                error_msg = f"SendGrid API error: {e.body}"
+                self.logger.error(error_msg)
+                results.extend(for_all({'success': False, 'error': error_msg}, chunk))
+            except Exception as e:
+                error_msg = f"Failed to send email: {str(e)}"
+                self.logger.error(error_msg)
+                results.extend(for_all({'success': False, 'error': error_msg}, chunk))
+        
+        return results
+    
     def send_bulk_emails(
         self,
         emails: List[Dict[str, Any]],
@@ -274,6 +348,10 @@ class SendGridEmailService:
                 'error': 'No email service available'
             }
     
+    def send_email_to_many(self, to_emails: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Send the same email to several recipients in one API call."""
+        return self.sendgrid_client.send_email_to_many(to_emails, **kwargs)
+    
     def send_bulk_emails(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Send bulk emails."""
         if self.sendgrid_client.is_available():
@@ -5,6 +5,7 @@ Provides SMTP-based email sending with OAuth2 and App Password support.
 
 import smtplib
 import logging
+import threading
 from typing import Dict, Any, Optional, List
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -24,29 +25,91 @@ class SMTPClient:
         self.logger = logging.getLogger(__name__)
         
         # SMTP configuration
-        self.smtp_host = getattr(self.config.email, 'smtp', {}).get('host', 'smtp.gmail.com')
-        self.smtp_port = getattr(self.config.email, 'smtp', {}).get('port', 587)
-        self.use_tls = getattr(self.config.email, 'smtp', {}).get('use_tls', True)
-        self.username = getattr(self.config.email, 'smtp', {}).get('username', '')
-        self.password = getattr(self.config.email, 'smtp', {}).get('password', '')
+        self.smtp_host = self._get_smtp_setting('host', 'smtp.gmail.com')
+        self.smtp_port = self._get_smtp_setting('port', 587)
+        self.use_tls = self._get_smtp_setting('use_tls', True)
+        self.username = self._get_smtp_setting('username', '')
+        self.password = self._get_smtp_setting('password', '')
         
         if not self.password:
             self.password = os.getenv('SMTP_PASSWORD', '')
         
+        # Persistent connection reused across sends
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        
         # Validate configuration
         if not self.username or not self.password:
             # Only warn if SMTP is actually needed (not when using SendGrid)
-            import os
             if os.getenv('EMAIL_PROVIDER', '').lower() != 'sendgrid':
                 self.logger.warning("SMTP credentials not configured. Set username/password in config or SMTP_PASSWORD environment variable.")
             self._configured = False
         else:
             self._configured = True
     
+    def _get_smtp_setting(self, key: str, default: Any) -> Any:
+        """Read an SMTP setting from ``email.smtp`` or the flat ``email.smtp_*`` fields."""
+        smtp_config = getattr(self.config.email, 'smtp', None)
+        if isinstance(smtp_config, dict):
+            return smtp_config.get(key, default)
+        if smtp_config is not None:
+            return getattr(smtp_config, key, default)
+        return getattr(self.config.email, f'smtp_{key}', default)
+    
+    def _server_factory(self) -> smtplib.SMTP:
+        """Open a new connection to the configured SMTP server."""
+        return smtplib.SMTP(self.smtp_host, self.smtp_port)
+    
+    def _get_conn(self) -> smtplib.SMTP:
+        """Get the persistent SMTP connection, reconnecting if it has dropped.
+        
+        STARTTLS and LOGIN happen only when a new connection is opened; an
+        existing one is checked with a NOOP before reuse. Callers must hold
+        ``self._conn_lock``.
+        """
+        if self._conn is not None:
+            try:
+                self._conn.noop()
+                return self._conn
+            except (smtplib.SMTPException, OSError):
+                self.logger.debug("SMTP connection lost, reconnecting")
+                self._discard_conn()
+        
+        conn = self._server_factory()
+        try:
+            if self.use_tls:
+                conn.starttls()
+            conn.login(self.username, self.password)
+        except Exception:
+            conn.close()
+            raise
+        
+        self._conn = conn
+        return conn
+    
+    def _discard_conn(self):
+        """Drop the persistent connection without raising."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    def close(self):
+        """Close the persistent SMTP connection."""
+        with self._conn_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._discard_conn()
+    
     def send_email(self, to_address: str, subject: str, body: str,
                    html_body: str = None, attachments: List[str] = None,
                    from_name: str = None) -> Dict[str, Any]:
-        """Send email via SMTP."""
+        """Send email via SMTP over the persistent connection."""
         
         if not self.username or not self.password:
             return {
@@ -60,17 +123,19 @@ class SMTPClient:
                 to_address, subject, body, html_body, attachments, from_name
             )
             
-            # Connect to SMTP server
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                # Login
-                server.login(self.username, self.password)
-                
-                # Send message
-                from_address = self.config.email.gmail.from_address or self.username
-                server.send_message(message, from_addr=from_address, to_addrs=[to_address])
+            # Send over the persistent connection, reconnecting once if the
+            # server dropped it between the NOOP check and the send
+            from_address = self.config.email.gmail.from_address or self.username
+            with self._conn_lock:
+                try:
+                    self._get_conn().send_message(
+                        message, from_addr=from_address, to_addrs=[to_address]
+                    )
+                except smtplib.SMTPServerDisconnected:
+                    self._discard_conn()
+                    self._get_conn().send_message(
+                        message, from_addr=from_address, to_addrs=[to_address]
+                    )
             
             self.logger.info(f"Email sent successfully via SMTP to {to_address}")
             
@@ -107,6 +172,18 @@ class SMTPClient:
                 'error': error_msg
             }
     
+    def send_bulk(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several emails, reusing one SMTP connection for all of them.
+        
+        Each message is a dict of ``send_email`` keyword arguments.
+        """
+        results = []
+        for message in messages:
+            result = self.send_email(**message)
+            result['recipient'] = message.get('to_address')
+            results.append(result)
+        return results
+    
     def _create_message(self, to_address: str, subject: str, body: str,
                        html_body: str = None, attachments: List[str] = None,
                        from_name: str = None) -> MIMEMultipart:
@@ -180,7 +257,7 @@ class SMTPClient:
             return False
         
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+            with self._server_factory() as server:
                 if self.use_tls:
                     server.starttls()
                 
@@ -303,6 +380,95 @@ class EmailServiceManager:
             'primary_service': self.primary_service
         }
     
+    @property
+    def uses_gmail_batches(self) -> bool:
+        """Whether send_bulk goes out as rate-limited Gmail batch requests."""
+        return self.primary_service == 'gmail_api' and self.gmail_service is not None
+    
+    def send_bulk(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several emails, batching through the Gmail API when it is primary.
+        
+        Each message is a dict of ``send_email`` keyword arguments. Messages the
+        Gmail batch could not deliver fall back to SMTP like ``send_email``.
+        """
+        if self.primary_service == 'sendgrid' and self.sendgrid_service:
+            return self._send_bulk_sendgrid(messages)
+        
+        if not self.uses_gmail_batches:
+            results = []
+            for message in messages:
+                result = self.send_email(**message)
+                result['recipient'] = message.get('to_address')
+                results.append(result)
+            return results
+        
+        try:
+            results = self.gmail_service.send_emails_batch(messages)
+        except Exception as e:
+            self.logger.warning(f"Gmail API batch error: {e}")
+            results = [
+                {'success': False, 'error': str(e), 'recipient': message.get('to_address')}
+                for message in messages
+            ]
+        
+        if self.smtp_client:
+            for index, message in enumerate(messages):
+                if results[index]['success']:
+                    continue
+                
+                self.logger.warning(f"Gmail API failed: {results[index].get('error')}")
+                try:
+                    result = self.smtp_client.send_email(**message)
+                    if result['success']:
+                        result['fallback_used'] = True
+                except Exception as e:
+                    self.logger.error(f"SMTP fallback also failed: {e}")
+                    result = {
+                        'success': False,
+                        'error': 'All email services failed',
+                        'primary_service': self.primary_service
+                    }
+                result['recipient'] = message.get('to_address')
+                results[index] = result
+        
+        return results
+    
+    def _send_bulk_sendgrid(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send messages through SendGrid, one API call per distinct body.
+        
+        Messages that share their body, HTML and sender name differ only in
+        recipient and subject, so each such group becomes the personalizations
+        of a single mail.
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for index, message in enumerate(messages):
+            key = (message.get('body'), message.get('html_body'), message.get('from_name'))
+            groups.setdefault(key, []).append(index)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        for (body, html_body, from_name), indices in groups.items():
+            recipients = [messages[index]['to_address'] for index in indices]
+            try:
+                group_results = self.sendgrid_service.send_email_to_many(
+                    recipients,
+                    subject=messages[indices[0]]['subject'],
+                    subjects=[messages[index]['subject'] for index in indices],
+                    text_content=body,
+                    html_content=html_body,
+                    from_name=from_name
+                )
+            except Exception as e:
+                self.logger.warning(f"SendGrid error: {e}")
+                group_results = [
+                    {'success': False, 'error': str(e), 'recipient': recipient}
+                    for recipient in recipients
+                ]
+            
+            for index, result in zip(indices, group_results):
+                results[index] = result
+        
+        return results
+    
     def test_services(self) -> Dict[str, Any]:
         """Test all available email services."""
         results = {
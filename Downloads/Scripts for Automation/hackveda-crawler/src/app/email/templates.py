@@ -5,19 +5,52 @@ Handles Jinja2 templating for personalized email content.
 
 import os
 import logging
+from datetime import date
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import json
 
-from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
 from jinja2.exceptions import TemplateError
 
 from ..config import get_config
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; BeautifulSoup is used otherwise
+    HTMLParser = None
+
+
+# Context values that render the same every time and are safe to cache on
+_CACHEABLE_CONTEXT_TYPES = (str, int, float, bool, type(None), date)
+
+
+# Currencies written with a symbol; anything else gets its code appended
+_CURRENCY_FORMATS = {
+    'USD': '${:,.2f}'.format,
+}
+
+
+def _format_currency(value: float, currency: str = 'USD') -> str:
+    """Format currency values."""
+    fmt = _CURRENCY_FORMATS.get(currency.upper())
+    if fmt:
+        return fmt(value)
+    return f"{value:,.2f} {currency}"
+
+
+@lru_cache(maxsize=128)
+def _compile_subject_template(source: str) -> Template:
+    """Compile a subject line template once per distinct source string."""
+    return Template(source)
+
 
 class EmailTemplateManager:
     """Manages email templates and rendering."""
     
+    RENDER_CACHE_SIZE = 512
+    
     def __init__(self, config=None, template_dir: str = None):
         self.config = config or get_config()
         self.logger = logging.getLogger(__name__)
@@ -30,20 +63,37 @@ class EmailTemplateManager:
         # Create template directory if it doesn't exist
         Path(self.template_dir).mkdir(parents=True, exist_ok=True)
         
-        # Initialize Jinja2 environment
+        # Initialize Jinja2 environment. Compiled templates are kept in memory
+        # without mtime checks and their bytecode is cached on disk, so a
+        # template is only parsed once per process.
         self.env = Environment(
             loader=FileSystemLoader(self.template_dir),
             autoescape=True,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=FileSystemBytecodeCache(),
+            auto_reload=False,
+            cache_size=-1
         )
         
         # Add custom filters
-        self.env.filters['currency'] = self._currency_filter
+        self.env.filters['currency'] = _format_currency
         self.env.filters['date_format'] = self._date_filter
         
+        # Default context only depends on configuration, so build it once
+        self._default_context = self._get_default_context()
+        
+        # Bulk sends often repeat the same context, so memoise rendered output
+        self._render_cached = lru_cache(maxsize=self.RENDER_CACHE_SIZE)(self._render)
+        
+        # (directory st_mtime_ns, sorted template names) from the last scan
+        self._list_cache = (None, [])
+        
         # Create default templates if they don't exist
         self._create_default_templates()
+        
+        # Compile all templates up front
+        self._precompile_templates()
     
     def _create_default_templates(self):
         """Create default email templates if they don't exist."""
@@ -64,6 +114,15 @@ class EmailTemplateManager:
                 except Exception as e:
                     self.logger.error(f"Failed to create template {template_name}: {e}")
     
+    def _precompile_templates(self):
+        """Load every template in the template directory into the environment cache."""
+        for template_name in self.list_templates():
+            try:
+                self.env.get_template(template_name)
+            except TemplateError as e:
+                # Reported again when the template is actually rendered
+                self.logger.debug(f"Skipping precompile of {template_name}: {e}")
+    
     def render_template(self, template_name: str, context: Dict[str, Any]) -> Dict[str, str]:
         """Render email template with context data."""
         try:
@@ -71,28 +130,18 @@ class EmailTemplateManager:
             if not template_name.endswith('.html'):
                 template_name += '.html'
             
-            # Load template
-            template = self.env.get_template(template_name)
-            
             # Add default context variables
-            full_context = self._get_default_context()
+            full_context = dict(self._default_context)
             full_context.update(context)
             
-            # Render template
-            html_content = template.render(**full_context)
-            
-            # Extract subject from template (if present)
-            subject = self._extract_subject(html_content, full_context)
+            context_items = tuple(sorted(full_context.items()))
+            if all(isinstance(value, _CACHEABLE_CONTEXT_TYPES) for _, value in context_items):
+                rendered = self._render_cached(template_name, context_items)
+            else:
+                rendered = self._render(template_name, context_items)
             
-            # Generate text version
-            text_content = self._html_to_text(html_content)
-            
-            return {
-                'subject': subject,
-                'html_body': html_content,
-                'text_body': text_content,
-                'template_name': template_name
-            }
+            # Callers may modify the result, so never hand out the cached dict
+            return dict(rendered)
             
         except TemplateNotFound:
             raise FileNotFoundError(f"Template not found: {template_name}")
@@ -101,6 +150,27 @@ class EmailTemplateManager:
         except Exception as e:
             raise Exception(f"Failed to render template {template_name}: {e}")
     
+    def _render(self, template_name: str, context_items: tuple) -> Dict[str, str]:
+        """Render a template from sorted context items."""
+        full_context = dict(context_items)
+        
+        # Load and render template
+        template = self.env.get_template(template_name)
+        html_content = template.render(**full_context)
+        
+        # Extract subject from template (if present)
+        subject = self._extract_subject(html_content, full_context)
+        
+        # Generate text version
+        text_content = self._html_to_text(html_content)
+        
+        return {
+            'subject': subject,
+            'html_body': html_content,
+            'text_body': text_content,
+            'template_name': template_name
+        }
+    
     def _get_default_context(self) -> Dict[str, Any]:
         """Get default template context variables."""
         return {
@@ -121,7 +191,7 @@ class EmailTemplateManager:
         if subject_match:
             subject_template = subject_match.group(1)
             # Render subject template
-            subject_tmpl = Template(subject_template)
+            subject_tmpl = _compile_subject_template(subject_template)
             return subject_tmpl.render(**context)
         
         # Default subject based on template name and context
@@ -139,6 +209,15 @@ class EmailTemplateManager:
     
     def _html_to_text(self, html_content: str) -> str:
         """Convert HTML content to plain text."""
+        if HTMLParser is not None:
+            # selectolax's C parser avoids building a bs4 tree per rendered email
+            tree = HTMLParser(html_content)
+            for node in tree.css('script, style'):
+                node.decompose()
+            
+            text = tree.root.text() if tree.root is not None else ''
+            return self._collapse_whitespace(text)
+        
         try:
             from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
@@ -147,13 +226,7 @@ class EmailTemplateManager:
             for script in soup(["script", "style"]):
                 script.decompose()
             
-            # Get text and clean it up
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            return text
+            return self._collapse_whitespace(soup.get_text())
             
         except ImportError:
             # Fallback: simple HTML tag removal
@@ -162,12 +235,11 @@ class EmailTemplateManager:
             text = re.sub(r'\s+', ' ', text)
             return text.strip()
     
-    def _currency_filter(self, value: float, currency: str = 'USD') -> str:
-        """Format currency values."""
-        if currency.upper() == 'USD':
-            return f"${value:,.2f}"
-        else:
-            return f"{value:,.2f} {currency}"
+    def _collapse_whitespace(self, text: str) -> str:
+        """Drop blank lines and split phrases separated by runs of spaces."""
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        return '\n'.join(chunk for chunk in chunks if chunk)
     
     def _date_filter(self, value, format: str = '%B %d, %Y') -> str:
         """Format date values."""
@@ -177,15 +249,19 @@ class EmailTemplateManager:
     
     def list_templates(self) -> List[str]:
         """List available templates."""
-        templates = []
         try:
-            for file in os.listdir(self.template_dir):
-                if file.endswith('.html'):
-                    templates.append(file)
+            # Adding, removing or renaming a file bumps the directory mtime
+            mtime = os.stat(self.template_dir).st_mtime_ns
+            if mtime == self._list_cache[0]:
+                return list(self._list_cache[1])
+            
+            with os.scandir(self.template_dir) as entries:
+                templates = sorted(entry.name for entry in entries if entry.name.endswith('.html'))
+            self._list_cache = (mtime, templates)
+            return list(templates)
         except Exception as e:
             self.logger.error(f"Failed to list templates: {e}")
-        
-        return sorted(templates)
+            return []
     
     def validate_template(self, template_name: str, sample_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate template by rendering with sample data."""
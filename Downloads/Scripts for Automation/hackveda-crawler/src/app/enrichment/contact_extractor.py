@@ -4,17 +4,149 @@ Extracts email addresses, contact pages, and social media links.
 """
 
 import re
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Set
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional; fall back to running each pattern
+    re2 = None
+
 from ..crawler.page_fetcher import PageFetcher, PageContent
 from ..config import get_config
 
 
-@dataclass
+# Link-based extraction only looks at anchors, so skip building the rest of the tree
+_LINKS_ONLY = SoupStrainer('a', href=True)
+
+# Patterns are compiled once at import instead of on every call
+_EMAIL_PATTERNS = [
+    re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE),
+    re.compile(r'\b[A-Za-z0-9._%+-]+\s*\[at\]\s*[A-Za-z0-9.-]+\s*\[dot\]\s*[A-Z|a-z]{2,}\b', re.IGNORECASE),
+    re.compile(r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b', re.IGNORECASE),
+]
+
+_PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'),
+    re.compile(r'\+?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,9}'),
+]
+
+_SOCIAL_PATTERNS = {
+    'linkedin': re.compile(r'https?://(?:www\.)?linkedin\.com/(?:in|company)/[a-zA-Z0-9-]+', re.IGNORECASE),
+    'twitter': re.compile(r'https?://(?:www\.)?twitter\.com/[a-zA-Z0-9_]+', re.IGNORECASE),
+    'facebook': re.compile(r'https?://(?:www\.)?facebook\.com/[a-zA-Z0-9.]+', re.IGNORECASE),
+    'instagram': re.compile(r'https?://(?:www\.)?instagram\.com/[a-zA-Z0-9_.]+', re.IGNORECASE),
+    'youtube': re.compile(r'https?://(?:www\.)?youtube\.com/(?:channel/|user/|c/)[a-zA-Z0-9_-]+', re.IGNORECASE),
+    'github': re.compile(r'https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+', re.IGNORECASE),
+}
+
+# Email patterns followed by phone patterns, indexed as in the RE2 prefilter set
+_TEXT_PATTERNS = _EMAIL_PATTERNS + _PHONE_PATTERNS
+
+
+def _build_text_prefilter():
+    """Compile every text pattern into one RE2 set, or return None without re2."""
+    if re2 is None:
+        return None
+    
+    try:
+        options = re2.Options()
+        options.case_sensitive = False
+        prefilter = re2.Set.SearchSet(options)
+        for pattern in _TEXT_PATTERNS:
+            prefilter.Add(pattern.pattern)
+        prefilter.Compile()
+        return prefilter
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"RE2 prefilter unavailable, using re only: {e}")
+        return None
+
+
+_TEXT_PREFILTER = _build_text_prefilter()
+
+# RE2's \s, \d and \b are ASCII-only (and its \s skips \v and \x1c-\x1f), while the
+# re patterns are Unicode-aware; RE2 may only judge text free of such characters
+_RE2_UNSAFE_RE = re.compile(r'[^\x00-\x0a\x0c-\x1b\x20-\x7f]')
+
+# Spam/invalid email indicators, matched anywhere in the address
+_SPAM_INDICATORS = frozenset({
+    'noreply', 'no-reply', 'donotreply', 'do-not-reply',
+    'mailer-daemon', 'postmaster', 'webmaster',
+    'example.com', 'test.com', 'localhost',
+    'sentry.io', 'bugsnag.com'
+})
+_SPAM_RE = re.compile('|'.join(re.escape(indicator) for indicator in sorted(_SPAM_INDICATORS)),
+                      re.IGNORECASE)
+
+# Words in a link target or label that suggest a contact page
+_CONTACT_KEYWORD_RE = re.compile(
+    r'contact|about|team|support|help|info|reach|touch|connect', re.IGNORECASE
+)
+
+# Confidence weights as (weight, count that earns the full weight) for
+# emails, contact pages, social links and phone numbers, in that order
+_CONFIDENCE_WEIGHTS = ((0.4, 3), (0.2, 2), (0.2, 3), (0.1, 2))
+_CONTACT_URL_BONUS = 0.1
+_CONTENT_LENGTH_BONUS = 0.05
+_CONTACT_URL_RE = re.compile(r'contact|about|team')
+
+# Domain quality bonus by TLD (or second level under a country code, e.g. .gov.uk)
+_TLD_QUALITY_BONUS = {
+    'edu': 0.3, 'gov': 0.3, 'org': 0.3,
+    'com': 0.1, 'net': 0.1,
+}
+_SPAMMY_DOMAIN_RE = re.compile(r'ads|click|buy|cheap|free|win')
+
+# Hosts each social pattern can match, so a link is checked against one pattern
+_SOCIAL_HOSTS = {
+    host: platform
+    for platform in _SOCIAL_PATTERNS
+    for host in (f'{platform}.com', f'www.{platform}.com')
+}
+
+_VALID_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_NOISE_RE = re.compile(r'[^\d+]')
+_DIGIT_RE = re.compile(r'\d')
+
+# Simple address pattern (US-focused)
+_ADDRESS_RE = re.compile(
+    r'\d+\s+[A-Za-z0-9\s,.-]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way|Place|Pl)'
+    r'\s*,?\s*[A-Za-z\s]+,?\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?',
+    re.IGNORECASE
+)
+
+
+def _compile_linear(pattern):
+    """Return an RE2 copy of a compiled re pattern, or None without re2."""
+    if re2 is None:
+        return None
+    
+    try:
+        options = re2.Options()
+        options.case_sensitive = not pattern.flags & re.IGNORECASE
+        return re2.compile(pattern.pattern, options)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"RE2 unavailable for {pattern.pattern!r}: {e}")
+        return None
+
+
+# The open-ended street part of _ADDRESS_RE makes re backtrack quadratically
+# over long runs of words; RE2 scans in linear time where it matches the same
+_ADDRESS_RE2 = _compile_linear(_ADDRESS_RE)
+
+
+def is_valid_email_format(email: str) -> bool:
+    """Check that email looks like a single plain address."""
+    return _VALID_EMAIL_RE.fullmatch(email) is not None
+
+
+@dataclass(slots=True)
 class ContactInfo:
     """Represents extracted contact information."""
     emails: List[str]
@@ -30,23 +162,19 @@ class ContactInfo:
 class ContactExtractor:
     """Extracts contact information from web pages."""
     
+    # Pages of one domain fetched at once; the fetcher still spaces request starts
+    MAX_CONCURRENT_FETCHES = 3
+    
     def __init__(self, config=None):
         self.config = config or get_config()
         self.logger = logging.getLogger(__name__)
         self.page_fetcher = PageFetcher(config)
         
         # Email regex patterns
-        self.email_patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            r'\b[A-Za-z0-9._%+-]+\s*\[at\]\s*[A-Za-z0-9.-]+\s*\[dot\]\s*[A-Z|a-z]{2,}\b',
-            r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b',
-        ]
+        self.email_patterns = _EMAIL_PATTERNS
         
         # Phone number patterns
-        self.phone_patterns = [
-            r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-            r'\+?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,9}',
-        ]
+        self.phone_patterns = _PHONE_PATTERNS
         
         # Common contact page paths
         self.contact_page_paths = [
@@ -58,22 +186,10 @@ class ContactExtractor:
         ]
         
         # Social media patterns
-        self.social_patterns = {
-            'linkedin': r'https?://(?:www\.)?linkedin\.com/(?:in|company)/[a-zA-Z0-9-]+',
-            'twitter': r'https?://(?:www\.)?twitter\.com/[a-zA-Z0-9_]+',
-            'facebook': r'https?://(?:www\.)?facebook\.com/[a-zA-Z0-9.]+',
-            'instagram': r'https?://(?:www\.)?instagram\.com/[a-zA-Z0-9_.]+',
-            'youtube': r'https?://(?:www\.)?youtube\.com/(?:channel/|user/|c/)[a-zA-Z0-9_-]+',
-            'github': r'https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+',
-        }
+        self.social_patterns = _SOCIAL_PATTERNS
         
         # Spam/invalid email indicators
-        self.spam_indicators = {
-            'noreply', 'no-reply', 'donotreply', 'do-not-reply',
-            'mailer-daemon', 'postmaster', 'webmaster',
-            'example.com', 'test.com', 'localhost',
-            'sentry.io', 'bugsnag.com'
-        }
+        self.spam_indicators = _SPAM_INDICATORS
     
     def extract_contacts_from_domain(self, domain: str, max_pages: int = 3) -> ContactInfo:
         """Extract contact information from a domain."""
@@ -100,11 +216,13 @@ class ContactExtractor:
         total_confidence = 0
         pages_processed = 0
         
-        for url in urls_to_check:
+        # Overlap page downloads; map() keeps results in URL order
+        max_workers = max(1, min(self.MAX_CONCURRENT_FETCHES, len(urls_to_check)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = list(executor.map(self._fetch_page, urls_to_check))
+        
+        for url, page_content in zip(urls_to_check, pages):
             try:
-                self.logger.debug(f"Extracting contacts from: {url}")
-                page_content = self.page_fetcher.fetch_page(url)
-                
                 if page_content and page_content.status_code == 200:
                     contact_info = self.extract_contacts_from_page(page_content)
                     
@@ -139,15 +257,46 @@ class ContactExtractor:
             source_urls=source_urls
         )
     
+    async def extract_contacts_from_domain_async(self, domain: str, max_pages: int = 3) -> ContactInfo:
+        """Extract contact information from a domain without blocking the event loop."""
+        return await asyncio.to_thread(self.extract_contacts_from_domain, domain, max_pages)
+    
+    async def extract_contacts_from_domains_async(self, domains: List[str], max_pages: int = 3,
+                                                  concurrency: int = 4) -> List[ContactInfo]:
+        """Extract contacts from several domains concurrently, returning them in domain order.
+        
+        At most ``concurrency`` domains are crawled at once; the shared page
+        fetcher still spaces request starts across all of them.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(domain: str) -> ContactInfo:
+            async with semaphore:
+                return await self.extract_contacts_from_domain_async(domain, max_pages)
+        
+        return list(await asyncio.gather(*(extract_one(domain) for domain in domains)))
+    
+    def _fetch_page(self, url: str) -> Optional[PageContent]:
+        """Fetch a page for contact extraction, logging instead of raising."""
+        try:
+            self.logger.debug(f"Extracting contacts from: {url}")
+            return self.page_fetcher.fetch_page(url)
+        except Exception as e:
+            self.logger.warning(f"Error extracting contacts from {url}: {e}")
+            return None
+    
     def extract_contacts_from_page(self, page_content: PageContent) -> ContactInfo:
         """Extract contact information from a single page."""
         if not page_content or not page_content.html:
             return ContactInfo([], [], {}, [], [], 0.0, 'empty_page', [])
         
-        soup = BeautifulSoup(page_content.html, 'html.parser')
+        soup = BeautifulSoup(page_content.html, 'lxml', parse_only=_LINKS_ONLY)
+        
+        # Find which email/phone patterns occur in one pass over the text
+        matched = self._match_text_patterns(page_content.content)
         
         # Extract emails
-        emails = self._extract_emails(page_content.content, soup)
+        emails = self._extract_emails(page_content.content, soup, matched)
         
         # Extract contact pages
         contact_pages = self._extract_contact_pages(soup, page_content.url)
@@ -156,7 +305,7 @@ class ContactExtractor:
         social_links = self._extract_social_links(soup)
         
         # Extract phone numbers
-        phone_numbers = self._extract_phone_numbers(page_content.content)
+        phone_numbers = self._extract_phone_numbers(page_content.content, matched)
         
         # Extract addresses (simple approach)
         addresses = self._extract_addresses(page_content.content)
@@ -177,52 +326,47 @@ class ContactExtractor:
             source_urls=[page_content.url]
         )
     
-    def _extract_emails(self, text: str, soup: BeautifulSoup) -> List[str]:
+    def _match_text_patterns(self, text: str) -> Optional[Set[int]]:
+        """Return indexes into _TEXT_PATTERNS present in text, or None if unknown."""
+        if _TEXT_PREFILTER is None or not text or _RE2_UNSAFE_RE.search(text):
+            return None
+        
+        return set(_TEXT_PREFILTER.Match(text) or ())
+    
+    def _extract_emails(self, text: str, soup: BeautifulSoup,
+                        matched: Optional[Set[int]] = None) -> List[str]:
         """Extract email addresses from text and HTML."""
         emails = set()
         
         # Extract from text content
-        for pattern in self.email_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            emails.update(matches)
+        for index, pattern in enumerate(self.email_patterns):
+            if matched is None or index in matched:
+                emails.update(pattern.findall(text))
         
         # Extract from mailto links
-        mailto_links = soup.find_all('a', href=re.compile(r'^mailto:', re.I))
-        for link in mailto_links:
-            href = link.get('href', '')
-            if href.startswith('mailto:'):
-                email = href[7:].split('?')[0]  # Remove query parameters
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            if href[:7].lower() == 'mailto:':
+                email = href[7:].split('?', 1)[0]  # Remove query parameters
                 if '@' in email:
                     emails.add(email)
         
-        # Clean and validate emails
-        cleaned_emails = []
-        for email in emails:
-            email = email.strip().lower()
-            if self._is_valid_email(email):
-                cleaned_emails.append(email)
-        
-        return list(set(cleaned_emails))
+        # Clean and dedupe, then validate each distinct address once
+        cleaned_emails = {email.strip().lower() for email in emails}
+        return [email for email in cleaned_emails if self._is_valid_email(email)]
     
     def _extract_contact_pages(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract contact page URLs."""
         contact_pages = set()
         
         # Find links that might lead to contact pages
-        contact_keywords = [
-            'contact', 'about', 'team', 'support', 'help',
-            'info', 'reach', 'touch', 'connect'
-        ]
-        
-        links = soup.find_all('a', href=True)
-        for link in links:
-            href = link.get('href', '').lower()
-            text = link.get_text(strip=True).lower()
+        for link in soup.find_all('a', href=True):
+            href = link['href']
             
-            # Check if link or text contains contact keywords
-            if any(keyword in href or keyword in text for keyword in contact_keywords):
-                full_url = urljoin(base_url, link['href'])
-                contact_pages.add(full_url)
+            # Only walk the link's text when the href itself does not match
+            if (_CONTACT_KEYWORD_RE.search(href)
+                    or _CONTACT_KEYWORD_RE.search(link.get_text(strip=True))):
+                contact_pages.add(urljoin(base_url, href))
         
         return list(contact_pages)
     
@@ -230,47 +374,41 @@ class ContactExtractor:
         """Extract social media links."""
         social_links = {}
         
-        # Find all links
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            href = link.get('href', '')
+        for link in soup.find_all('a', href=True):
+            href = link['href']
             
-            # Check against social media patterns
-            for platform, pattern in self.social_patterns.items():
-                if re.match(pattern, href, re.IGNORECASE):
-                    social_links[platform] = href
-                    break
+            # Pick the candidate platform from the host, then confirm with its pattern
+            _, sep, rest = href.partition('://')
+            if not sep:
+                continue
+            
+            platform = _SOCIAL_HOSTS.get(rest.split('/', 1)[0].lower())
+            if platform and self.social_patterns[platform].match(href):
+                social_links[platform] = href
         
         return social_links
     
-    def _extract_phone_numbers(self, text: str) -> List[str]:
+    def _extract_phone_numbers(self, text: str, matched: Optional[Set[int]] = None) -> List[str]:
         """Extract phone numbers from text."""
         phone_numbers = set()
         
-        for pattern in self.phone_patterns:
-            matches = re.findall(pattern, text)
-            phone_numbers.update(matches)
-        
-        # Clean phone numbers
-        cleaned_phones = []
-        for phone in phone_numbers:
-            # Remove common formatting
-            cleaned = re.sub(r'[^\d+]', '', phone)
-            if len(cleaned) >= 10:  # Minimum valid phone length
-                cleaned_phones.append(phone.strip())
+        offset = len(self.email_patterns)
+        for index, pattern in enumerate(self.phone_patterns, start=offset):
+            if matched is None or index in matched:
+                phone_numbers.update(pattern.findall(text))
         
-        return list(set(cleaned_phones))
+        # Keep numbers with enough digits once common formatting is removed
+        return list({
+            phone.strip() for phone in phone_numbers
+            if len(_PHONE_NOISE_RE.sub('', phone)) >= 10  # Minimum valid phone length
+        })
     
     def _extract_addresses(self, text: str) -> List[str]:
         """Extract physical addresses (simple approach)."""
-        addresses = []
-        
-        # Simple address pattern (US-focused)
-        address_pattern = r'\d+\s+[A-Za-z0-9\s,.-]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way|Place|Pl)\s*,?\s*[A-Za-z\s]+,?\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?'
-        
-        matches = re.findall(address_pattern, text, re.IGNORECASE)
-        addresses.extend(matches)
+        if _ADDRESS_RE2 is not None and not _RE2_UNSAFE_RE.search(text):
+            addresses = _ADDRESS_RE2.findall(text)
+        else:
+            addresses = _ADDRESS_RE.findall(text)
         
         return list(set(addresses))
     
@@ -280,76 +418,48 @@ class ContactExtractor:
             return False
         
         # Check against spam indicators
-        email_lower = email.lower()
-        if any(indicator in email_lower for indicator in self.spam_indicators):
+        if _SPAM_RE.search(email):
             return False
         
         # Basic format validation
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-            return False
-        
-        return True
+        return is_valid_email_format(email)
     
     def _validate_emails(self, emails: List[str]) -> List[str]:
         """Validate and filter email list."""
-        validated = []
-        
-        for email in emails:
-            if self._is_valid_email(email):
-                validated.append(email)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_emails = []
-        for email in validated:
-            if email not in seen:
-                seen.add(email)
-                unique_emails.append(email)
-        
-        return unique_emails
+        # Dedupe first (order preserving) so each address is checked once
+        return [email for email in dict.fromkeys(emails) if self._is_valid_email(email)]
     
     def _calculate_confidence_score(self, emails: List[str], contact_pages: List[str],
                                   social_links: Dict[str, str], phone_numbers: List[str],
                                   page_content: PageContent) -> float:
         """Calculate confidence score for extracted contact information."""
+        counts = (len(emails), len(contact_pages), len(social_links), len(phone_numbers))
         score = 0.0
         
-        # Email score (most important)
-        if emails:
-            score += 0.4 * min(1.0, len(emails) / 3)  # Max score for 3+ emails
-        
-        # Contact pages score
-        if contact_pages:
-            score += 0.2 * min(1.0, len(contact_pages) / 2)
-        
-        # Social links score
-        if social_links:
-            score += 0.2 * min(1.0, len(social_links) / 3)
-        
-        # Phone numbers score
-        if phone_numbers:
-            score += 0.1 * min(1.0, len(phone_numbers) / 2)
+        for count, (weight, full_at) in zip(counts, _CONFIDENCE_WEIGHTS):
+            if count:
+                score += weight * min(1.0, count / full_at)
         
         # Page quality indicators
         if page_content:
-            # Check if it's a contact page
-            url_lower = page_content.url.lower()
-            if any(keyword in url_lower for keyword in ['contact', 'about', 'team']):
-                score += 0.1
+            if _CONTACT_URL_RE.search(page_content.url.lower()):
+                score += _CONTACT_URL_BONUS
             
-            # Check content quality
             if len(page_content.content) > 500:
-                score += 0.05
+                score += _CONTENT_LENGTH_BONUS
         
         return min(1.0, score)
     
     def enrich_domain_info(self, domain: str) -> Dict[str, Any]:
         """Enrich domain with additional metadata."""
+        labels = domain.split('.')
+        has_tld = len(labels) > 1
+        
         enrichment_data = {
             'domain': domain,
-            'tld': domain.split('.')[-1] if '.' in domain else '',
-            'is_subdomain': len(domain.split('.')) > 2,
-            'main_domain': '.'.join(domain.split('.')[-2:]) if '.' in domain else domain,
+            'tld': labels[-1] if has_tld else '',
+            'is_subdomain': len(labels) > 2,
+            'main_domain': '.'.join(labels[-2:]) if has_tld else domain,
         }
         
         # Analyze domain characteristics
@@ -358,20 +468,21 @@ class ContactExtractor:
         # Quality indicators
         quality_score = 0.5  # Base score
         
-        if any(tld in domain_lower for tld in ['.edu', '.gov', '.org']):
-            quality_score += 0.3
-        elif any(tld in domain_lower for tld in ['.com', '.net']):
-            quality_score += 0.1
+        if has_tld:
+            tld = labels[-1].lower()
+            bonus = _TLD_QUALITY_BONUS.get(tld, 0.0)
+            if not bonus and len(tld) == 2 and len(labels) > 2:
+                bonus = _TLD_QUALITY_BONUS.get(labels[-2].lower(), 0.0)
+            quality_score += bonus
         
         # Check for spam indicators
-        spam_indicators = ['ads', 'click', 'buy', 'cheap', 'free', 'win']
-        if any(indicator in domain_lower for indicator in spam_indicators):
+        if _SPAMMY_DOMAIN_RE.search(domain_lower):
             quality_score -= 0.2
         
         enrichment_data['quality_score'] = max(0.0, min(1.0, quality_score))
         
         # Additional metadata
-        enrichment_data['has_numbers'] = bool(re.search(r'\d', domain))
+        enrichment_data['has_numbers'] = bool(_DIGIT_RE.search(domain))
         enrichment_data['has_hyphens'] = '-' in domain
         enrichment_data['length'] = len(domain)
         
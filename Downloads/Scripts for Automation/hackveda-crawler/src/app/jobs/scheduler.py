@@ -120,22 +120,22 @@ class CrawlJob(BaseJob):
                 # Crawl keywords
                 all_results = self.crawler.crawl_keywords(keywords, max_results)
                 
-                # Store results
-                stored_results = []
-                for result in all_results:
-                    search_result = result_repo.create(
-                        crawl_session_id=crawl_session.id,
-                        title=result.title,
-                        url=result.url,
-                        snippet=result.snippet,
-                        rank=result.rank,
-                        domain=result.domain,
-                        crawl_timestamp=result.crawl_timestamp,
-                        response_time=result.response_time,
-                        source_keyword=result.result_metadata.get('keyword', ''),
-                        result_metadata=result.result_metadata
-                    )
-                    stored_results.append(search_result)
+                # Store results in one bulk insert
+                stored_results = result_repo.bulk_create([
+                    {
+                        'crawl_session_id': crawl_session.id,
+                        'title': result.title,
+                        'url': result.url,
+                        'snippet': result.snippet,
+                        'rank': result.rank,
+                        'domain': result.domain,
+                        'crawl_timestamp': result.crawl_timestamp,
+                        'response_time': result.response_time,
+                        'source_keyword': result.result_metadata.get('keyword', ''),
+                        'result_metadata': result.result_metadata
+                    }
+                    for result in all_results
+                ])
                 
                 # Update session
                 crawl_repo.update_status(crawl_session.id, 'completed')
@@ -163,6 +163,12 @@ class CrawlJob(BaseJob):
 class EmailJob(BaseJob):
     """Job for sending emails."""
     
+    # Campaign messages handed to the email service at once
+    SEND_BATCH_SIZE = 100
+    
+    # Gap between templated bulk emails, in seconds
+    BULK_SEND_INTERVAL = 5
+    
     def __init__(self, config=None):
         super().__init__("email_job", config)
         self.email_service = EmailServiceManager(config)
@@ -179,6 +185,36 @@ class EmailJob(BaseJob):
         else:
             raise ValueError("Either campaign_id or (template_name + recipients) must be provided")
     
+    def _send_batch_size(self, rate_per_minute: Optional[float]) -> int:
+        """Number of messages to hand to send_bulk at once.
+        
+        Only Gmail batch requests are paced by the email service itself, and
+        even those go out as one burst, so a batch never holds more than a
+        minute's worth of the rate. SMTP and SendGrid send a batch back to
+        back, so they get one message at a time and keep per-message spacing.
+        """
+        if not rate_per_minute:
+            return self.SEND_BATCH_SIZE
+        if not self.email_service.uses_gmail_batches:
+            return 1
+        return max(1, min(self.SEND_BATCH_SIZE, int(rate_per_minute)))
+    
+    def _send_chunk(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send messages through send_bulk, returning exactly one result per message."""
+        try:
+            send_results = list(self.email_service.send_bulk(messages))[:len(messages)]
+        except Exception as e:
+            return [{'success': False, 'error': str(e)} for _ in messages]
+        
+        # A short result list must not drop messages from logs and counts
+        missing = len(messages) - len(send_results)
+        if missing:
+            self.logger.error(f"Email service returned {len(send_results)} results for {len(messages)} messages")
+            send_results.extend(
+                {'success': False, 'error': 'No result from email service'} for _ in range(missing)
+            )
+        return send_results
+    
     def _send_campaign_emails(self, campaign_id: int) -> Dict[str, Any]:
         """Send emails for a specific campaign."""
         with self.db_manager.get_session() as session:
@@ -218,18 +254,10 @@ class EmailJob(BaseJob):
             email_repo = EmailLogRepository(session)
             results = []
             
+            # Build a message per contact, then send in batches
+            queued = []
             for contact in contacts:
                 try:
-                    # Create email log entry
-                    email_log = email_repo.create(
-                        campaign_id=campaign.id,
-                        contact_id=contact.id,
-                        to_address=contact.email,
-                        from_address=campaign.from_address,
-                        subject="[To be rendered]",  # Will be updated after sending
-                        status='queued'
-                    )
-                    
                     # Prepare context
                     context = {
                         'recipient_name': contact.name or '',
@@ -237,53 +265,71 @@ class EmailJob(BaseJob):
                         'contact_email': contact.email
                     }
                     
-                    # Send email
-                    result = self.email_service.send_email(
-                        to_address=contact.email,
-                        subject=campaign.subject_template,  # Should be rendered with context
-                        body="Email body",  # Should use template
-                        from_name=campaign.from_name
-                    )
+                    queued.append((contact, contact.id, {
+                        'to_address': contact.email,
+                        'subject': campaign.subject_template,  # Should be rendered with context
+                        'body': "Email body",  # Should use template
+                        'from_name': campaign.from_name
+                    }))
                     
-                    # Update log
-                    if result['success']:
-                        email_repo.update_status(
-                            email_log.id, 'sent',
-                            message_id=result.get('message_id'),
-                            sent_at=datetime.utcnow()
-                        )
+                except Exception as e:
+                    self.logger.error(f"Failed to send email to {contact.email}: {e}")
+                    campaign.emails_failed += 1
+                    results.append({
+                        'contact_id': contact.id,
+                        'email': contact.email,
+                        'success': False,
+                        'error': str(e)
+                    })
+            
+            batch_size = self._send_batch_size(campaign.send_rate_limit)
+            for start in range(0, len(queued), batch_size):
+                chunk = queued[start:start + batch_size]
+                send_results = self._send_chunk([message for _, _, message in chunk])
+                
+                sent_at = datetime.utcnow()
+                log_rows = []
+                for (contact, contact_id, message), result in zip(chunk, send_results):
+                    success = result.get('success', False)
+                    if success:
                         campaign.emails_sent += 1
                         
                         # Update contact status
                         contact.email_status = 'contacted'
-                        contact.last_contacted = datetime.utcnow()
+                        contact.last_contacted = sent_at
                     else:
-                        email_repo.update_status(
-                            email_log.id, 'failed',
-                            error_message=result.get('error')
-                        )
                         campaign.emails_failed += 1
                     
-                    results.append({
-                        'contact_id': contact.id,
-                        'email': contact.email,
-                        'success': result['success'],
-                        'error': result.get('error')
+                    # executemany needs the same keys in every row
+                    log_rows.append({
+                        'campaign_id': campaign_id,
+                        'contact_id': contact_id,
+                        'to_address': message['to_address'],
+                        'from_address': campaign.from_address,
+                        'subject': message['subject'],
+                        'status': 'sent' if success else 'failed',
+                        'sent_at': sent_at if success else None,
+                        'message_id': result.get('message_id'),
+                        'error_message': None if success else result.get('error')
                     })
                     
-                    # Rate limiting delay
-                    if campaign.send_rate_limit:
-                        time.sleep(60 / campaign.send_rate_limit)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to send email to {contact.email}: {e}")
-                    campaign.emails_failed += 1
                     results.append({
-                        'contact_id': contact.id,
-                        'email': contact.email,
-                        'success': False,
-                        'error': str(e)
+                        'contact_id': contact_id,
+                        'email': message['to_address'],
+                        'success': success,
+                        'error': result.get('error')
                     })
+                
+                # One parameterized INSERT for the whole batch's logs
+                email_repo.insert_many(log_rows)
+                
+                # Commit each delivered batch so a later failure cannot roll back
+                # its logs, counters and contact statuses and cause a resend
+                session.commit()
+                
+                # Rate limiting delay, spread over the batch
+                if campaign.send_rate_limit and start + batch_size < len(queued):
+                    time.sleep(len(chunk) * 60 / campaign.send_rate_limit)
             
             # Update campaign status
             campaign.status = 'completed'
@@ -302,36 +348,43 @@ class EmailJob(BaseJob):
     
     def _send_bulk_emails(self, template_name: str, recipients: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Send bulk emails using template."""
-        results = []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(recipients)
         
+        # Build every message first, then hand them to the email service in batches
+        queued = []
         for i, recipient in enumerate(recipients):
             try:
-                result = self.email_service.send_email(
-                    to_address=recipient['email'],
-                    subject=recipient.get('subject', f"Message from {self.config.email.gmail.from_name}"),
-                    body=recipient.get('body', 'Default message body'),
-                    html_body=recipient.get('html_body'),
-                    from_name=recipient.get('from_name')
-                )
-                
-                results.append({
-                    'index': i,
-                    'email': recipient['email'],
-                    'success': result['success'],
-                    'error': result.get('error')
-                })
-                
-                # Rate limiting
-                if i < len(recipients) - 1:
-                    time.sleep(5)  # 5 second delay between emails
-                
+                queued.append((i, {
+                    'to_address': recipient['email'],
+                    'subject': recipient.get('subject', f"Message from {self.config.email.gmail.from_name}"),
+                    'body': recipient.get('body', 'Default message body'),
+                    'html_body': recipient.get('html_body'),
+                    'from_name': recipient.get('from_name')
+                }))
             except Exception as e:
-                results.append({
+                results[i] = {
                     'index': i,
                     'email': recipient.get('email', 'unknown'),
                     'success': False,
                     'error': str(e)
-                })
+                }
+        
+        batch_size = self._send_batch_size(60 / self.BULK_SEND_INTERVAL)
+        for start in range(0, len(queued), batch_size):
+            chunk = queued[start:start + batch_size]
+            send_results = self._send_chunk([message for _, message in chunk])
+            
+            for (i, message), result in zip(chunk, send_results):
+                results[i] = {
+                    'index': i,
+                    'email': message['to_address'],
+                    'success': result.get('success', False),
+                    'error': result.get('error')
+                }
+            
+            # Rate limiting, BULK_SEND_INTERVAL per email spread over the batch
+            if start + batch_size < len(queued):
+                time.sleep(self.BULK_SEND_INTERVAL * len(chunk))
         
         successful = len([r for r in results if r['success']])
         failed = len(results) - successful
@@ -408,13 +461,14 @@ class JobScheduler:
             'cleanup': CleanupJob(config)
         }
         
-        self._running = False
+        # Set once the scheduler's worker threads are up, cleared on shutdown
+        self._running_evt = threading.Event()
     
     def start(self):
         """Start the scheduler."""
-        if not self._running:
+        if not self._running_evt.is_set():
             self.scheduler.start()
-            self._running = True
+            self._running_evt.set()
             self.logger.info("Job scheduler started")
             
             # Add default scheduled jobs if configured
@@ -422,9 +476,9 @@ class JobScheduler:
     
     def stop(self):
         """Stop the scheduler."""
-        if self._running:
+        if self._running_evt.is_set():
             self.scheduler.shutdown(wait=True)
-            self._running = False
+            self._running_evt.clear()
             self.logger.info("Job scheduler stopped")
     
     def _add_default_jobs(self):
@@ -537,7 +591,7 @@ class JobScheduler:
     def get_job_status(self) -> Dict[str, Any]:
         """Get scheduler and job status."""
         return {
-            'scheduler_running': self._running,
+            'scheduler_running': self._running_evt.is_set(),
             'total_jobs': len(self.scheduler.get_jobs()),
             'jobs': self.list_jobs(),
             'last_results': {
@@ -551,4 +605,8 @@ class JobScheduler:
     
     def is_running(self) -> bool:
         """Check if scheduler is running."""
-        return self._running
+        return self._running_evt.is_set()
+    
+    def wait_running(self, timeout: Optional[float] = None) -> bool:
+        """Block until the scheduler is running or timeout expires; return whether it is."""
+        return self._running_evt.wait(timeout)
@@ -8,6 +8,7 @@ import sys
 import json
 import csv
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -113,21 +114,33 @@ def keywords(ctx, keywords, max_results, session_name, output, demo):
         
         task = progress.add_task("Crawling keywords...", total=len(keyword_list))
         
-        all_results = []
+        # Demo keywords only wait on simulated latency, so overlap them; Google
+        # requests stay serial behind the crawler's rate limiter
+        max_workers = min(8, len(keyword_list)) if demo else 1
+        keyword_results = [[] for _ in keyword_list]
         
-        for keyword in keyword_list:
-            progress.update(task, description=f"Crawling: {keyword}")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(crawler.crawl_keyword, keyword, max_results): index
+                for index, keyword in enumerate(keyword_list)
+            }
             
-            try:
-                results = crawler.crawl_keyword(keyword, max_results)
-                all_results.extend(results)
+            for future in as_completed(futures):
+                index = futures[future]
+                keyword = keyword_list[index]
                 
-                console.print(f"  ✓ {keyword}: {len(results)} results")
+                try:
+                    keyword_results[index] = future.result()
+                    console.print(f"  ✓ {keyword}: {len(keyword_results[index])} results")
+                    
+                except Exception as e:
+                    console.print(f"  ✗ {keyword}: Error - {e}")
                 
-            except Exception as e:
-                console.print(f"  ✗ {keyword}: Error - {e}")
-            
-            progress.advance(task)
+                progress.update(task, description=f"Crawled: {keyword}")
+                progress.advance(task)
+        
+        # Keep results in keyword order regardless of completion order
+        all_results = [result for results in keyword_results for result in results]
     
     console.print(f"\n[green]Crawling completed! Total results: {len(all_results)}[/green]")
     
@@ -149,20 +162,22 @@ def keywords(ctx, keywords, max_results, session_name, output, demo):
                 config={'max_results': max_results, 'source': 'cli'}
             )
             
-            # Store results
-            for result in all_results:
-                result_repo.create(
-                    crawl_session_id=crawl_session.id,
-                    title=result.title,
-                    url=result.url,
-                    snippet=result.snippet,
-                    rank=result.rank,
-                    domain=result.domain,
-                    crawl_timestamp=result.crawl_timestamp,
-                    response_time=result.response_time,
-                    source_keyword=result.result_metadata.get('keyword', ''),
-                    result_metadata=result.result_metadata
-                )
+            # Store results in one bulk insert
+            result_repo.bulk_create([
+                {
+                    'crawl_session_id': crawl_session.id,
+                    'title': result.title,
+                    'url': result.url,
+                    'snippet': result.snippet,
+                    'rank': result.rank,
+                    'domain': result.domain,
+                    'crawl_timestamp': result.crawl_timestamp,
+                    'response_time': result.response_time,
+                    'source_keyword': result.result_metadata.get('keyword', ''),
+                    'result_metadata': result.result_metadata
+                }
+                for result in all_results
+            ])
             
             crawl_repo.update_status(crawl_session.id, 'completed')
             crawl_session.total_results = len(all_results)
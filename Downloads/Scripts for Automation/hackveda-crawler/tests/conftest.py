@@ -7,20 +7,31 @@ import sys
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, patch
+
+from bs4 import BeautifulSoup
 
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from app.config import Config, ConfigManager
 from app.database.db import DatabaseManager
+from app.email.gmail_api import GmailAuthManager
+from app.email.smtp_client import SMTPClient
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config():
-    """Provide test configuration."""
+    """Provide test configuration (built once per session).
+
+    Plain ``SimpleNamespace`` objects are used instead of ``Mock`` so that
+    attribute access is cheap and typos surface as ``AttributeError``.
+    Tests that need different values should use ``monkeypatch.setattr``
+    so the shared configuration is restored afterwards.
+    """
     return Config(
-        crawler=Mock(
+        crawler=SimpleNamespace(
             mode='light',
             user_agent='TestBot/1.0',
             delay_min=0.1,
@@ -30,24 +41,37 @@ def test_config():
             timeout=10,
             max_retries=1
         ),
-        database=Mock(
+        database=SimpleNamespace(
             url='sqlite:///:memory:',
             pool_size=1,
             max_overflow=0,
+            pool_recycle=3600,
+            max_connections=100,
             echo=False
         ),
-        email=Mock(
+        email=SimpleNamespace(
             provider='gmail_api',
-            gmail=Mock(
+            from_email='test@example.com',
+            from_name='Test User',
+            sendgrid_api_key='',
+            gmail=SimpleNamespace(
                 credentials_path='test_credentials.json',
                 token_path='test_token.json',
                 from_address='test@example.com',
                 from_name='Test User',
                 daily_limit=100,
-                rate_limit=10
+                rate_limit=10,
+                batch_size=20
+            ),
+            smtp=SimpleNamespace(
+                host='smtp.gmail.com',
+                port=587,
+                use_tls=True,
+                username='test@example.com',
+                password='test_password'
             )
         ),
-        app=Mock(
+        app=SimpleNamespace(
             concurrency=1,
             log_level='DEBUG',
             data_retention_days=30
@@ -55,6 +79,20 @@ def test_config():
     )
 
 
+@pytest.fixture
+def gmail_auth_manager(test_config):
+    """Provide Gmail auth manager built from the shared test configuration."""
+    return GmailAuthManager(test_config)
+
+
+@pytest.fixture
+def smtp_client(test_config):
+    """Provide SMTP client with the server connection factory mocked."""
+    client = SMTPClient(test_config)
+    with patch.object(client, '_server_factory'):
+        yield client
+
+
 @pytest.fixture
 def temp_dir():
     """Provide temporary directory for tests."""
@@ -62,6 +100,19 @@ def temp_dir():
         yield Path(tmp_dir)
 
 
+@pytest.fixture
+def mocked_db_manager(test_config, monkeypatch):
+    """Provide a real DatabaseManager wired to a mock engine and session.
+    
+    Yields ``(db_manager, mock_session, mock_engine)``.
+    """
+    mock_engine = Mock()
+    mock_session = Mock()
+    monkeypatch.setattr('app.database.db.create_engine', Mock(return_value=mock_engine))
+    monkeypatch.setattr('app.database.db.sessionmaker', Mock(return_value=Mock(return_value=mock_session)))
+    yield DatabaseManager(test_config), mock_session, mock_engine
+
+
 @pytest.fixture
 def mock_db_manager(test_config):
     """Provide mock database manager."""
@@ -115,7 +166,7 @@ def mock_requests():
     return responses
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_html_content():
     """Sample HTML content for testing."""
     return """
@@ -141,6 +192,12 @@ def sample_html_content():
     """
 
 
+@pytest.fixture(scope='session')
+def sample_soup(sample_html_content):
+    """sample_html_content parsed once with lxml; tests must not modify it."""
+    return BeautifulSoup(sample_html_content, 'lxml')
+
+
 @pytest.fixture
 def mock_gmail_service():
     """Mock Gmail service for testing."""
@@ -188,7 +245,7 @@ def mock_google_search_response():
 
 
 # Test data fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_email_template():
     """Sample email template for testing."""
     return {
@@ -214,6 +271,34 @@ def sample_email_template():
     }
 
 
+@pytest.fixture(scope="session")
+def templates_dir(tmp_path_factory, sample_email_template):
+    """Provide a template directory shared by the whole session.
+    
+    Common templates are written once; tests that need their own template
+    should write it under a unique name.
+    """
+    directory = tmp_path_factory.mktemp("templates")
+    (directory / 'test_template.html').write_text(sample_email_template['html_body'])
+    (directory / 'test_subject.html').write_text("""
+    <!-- SUBJECT: Hello {{ recipient_name }}! -->
+    <html>
+    <body>
+        <h1>Hello {{ recipient_name }}!</h1>
+        <p>Welcome to {{ company_name }}.</p>
+    </body>
+    </html>
+    """)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def template_manager(templates_dir):
+    """Provide a single EmailTemplateManager for the session."""
+    from app.email.templates import EmailTemplateManager
+    return EmailTemplateManager(template_dir=str(templates_dir))
+
+
 @pytest.fixture
 def sample_contacts():
     """Sample contact data for testing."""
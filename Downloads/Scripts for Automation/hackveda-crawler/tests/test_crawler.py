@@ -428,3 +428,37 @@ class TestResultParser:
         assert 'domain' in csv_row
         assert 'keywords' in csv_row
         assert isinstance(csv_row['keywords'], str)  # Should be comma-separated string
+
+
+class TestDemoCrawler:
+    """Test demo crawler functionality."""
+    
+    def test_crawl_keywords_async_runs_keywords_concurrently(self, test_config):
+        """Test keywords overlap up to the concurrency limit and keep their order."""
+        import asyncio
+        from app.crawler.demo_crawler import DemoCrawler
+        
+        crawler = DemoCrawler(test_config)
+        in_flight = 0
+        peak = 0
+        
+        async def fake_crawl_keyword_async(keyword, max_results):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [crawler._generate_result(keyword, i) for i in range(max_results)]
+        
+        crawler.crawl_keyword_async = fake_crawl_keyword_async
+        done = []
+        
+        with patch('builtins.print'):
+            results = asyncio.run(crawler.crawl_keywords_async(
+                ['a', 'b', 'c', 'd'], 2, concurrency=2,
+                on_keyword_done=lambda keyword, batch: done.append(keyword)
+            ))
+        
+        assert peak == 2
+        assert sorted(done) == ['a', 'b', 'c', 'd']
+        assert [r.result_metadata['keyword'] for r in results] == ['a', 'a', 'b', 'b', 'c', 'c', 'd', 'd']
@@ -4,8 +4,10 @@ Tests for email module.
 
 import pytest
 import json
+import smtplib
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock, mock_open
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.email.gmail_api import GmailService, GmailAuthManager, GmailRateLimiter
 from app.email.smtp_client import SMTPClient, EmailServiceManager
@@ -15,41 +17,63 @@ from app.email.templates import EmailTemplateManager
 class TestGmailAuthManager:
     """Test Gmail OAuth2 authentication manager."""
     
-    def test_auth_manager_initialization(self, test_config):
+    def test_auth_manager_initialization(self, gmail_auth_manager, test_config):
         """Test auth manager initialization."""
-        auth_manager = GmailAuthManager(test_config)
-        
-        assert auth_manager.config == test_config
-        assert auth_manager.credentials_path == test_config.email.gmail.credentials_path
-        assert auth_manager.token_path == test_config.email.gmail.token_path
-        assert auth_manager.SCOPES is not None
+        assert gmail_auth_manager.config == test_config
+        assert gmail_auth_manager.credentials_path == test_config.email.gmail.credentials_path
+        assert gmail_auth_manager.token_path == test_config.email.gmail.token_path
+        assert gmail_auth_manager.SCOPES is not None
     
     @patch('os.path.exists')
     @patch('builtins.open', new_callable=mock_open, read_data='{"token": "test_token"}')
     @patch('app.email.gmail_api.Credentials')
-    def test_get_credentials_existing_valid(self, mock_credentials, mock_file, mock_exists, test_config):
+    def test_get_credentials_existing_valid(self, mock_credentials, mock_file, mock_exists, gmail_auth_manager):
         """Test getting existing valid credentials."""
         mock_exists.return_value = True
-        mock_creds = Mock()
-        mock_creds.valid = True
+        mock_creds = SimpleNamespace(valid=True, expiry=None)
         mock_credentials.from_authorized_user_file.return_value = mock_creds
         
-        auth_manager = GmailAuthManager(test_config)
-        creds = auth_manager.get_credentials()
+        creds = gmail_auth_manager.get_credentials()
         
         assert creds == mock_creds
         mock_credentials.from_authorized_user_file.assert_called_once()
     
     @patch('os.path.exists')
-    def test_get_credentials_no_token_file(self, mock_exists, test_config):
+    @patch('app.email.gmail_api.Credentials')
+    def test_get_credentials_cached(self, mock_credentials, mock_exists, gmail_auth_manager):
+        """Test credentials are loaded from the token file only once."""
+        mock_exists.return_value = True
+        mock_creds = SimpleNamespace(valid=True, expiry=datetime.utcnow() + timedelta(hours=1))
+        mock_credentials.from_authorized_user_file.return_value = mock_creds
+        
+        first = gmail_auth_manager.get_credentials()
+        second = gmail_auth_manager.get_credentials()
+        
+        assert first is second is mock_creds
+        mock_credentials.from_authorized_user_file.assert_called_once()
+        assert mock_exists.call_count <= 1
+    
+    @patch('os.path.exists')
+    @patch('app.email.gmail_api.Credentials')
+    def test_get_credentials_reloads_near_expiry(self, mock_credentials, mock_exists, gmail_auth_manager):
+        """Test cached credentials are reloaded when close to expiry."""
+        mock_exists.return_value = True
+        mock_creds = SimpleNamespace(valid=True, expiry=datetime.utcnow() + timedelta(seconds=30))
+        mock_credentials.from_authorized_user_file.return_value = mock_creds
+        
+        gmail_auth_manager.get_credentials()
+        gmail_auth_manager.get_credentials()
+        
+        assert mock_credentials.from_authorized_user_file.call_count == 2
+    
+    @patch('os.path.exists')
+    def test_get_credentials_no_token_file(self, mock_exists, gmail_auth_manager):
         """Test behavior when no token file exists."""
         mock_exists.return_value = False
         
-        auth_manager = GmailAuthManager(test_config)
-        
         # Should attempt OAuth flow (which will fail in test)
         with pytest.raises(FileNotFoundError):
-            auth_manager.get_credentials()
+            gmail_auth_manager.get_credentials()
     
     def test_check_credentials_status_no_files(self, test_config):
         """Test credentials status when no files exist."""
@@ -86,6 +110,19 @@ class TestGmailRateLimiter:
         assert limiter.can_send_email() is True
         assert limiter.sent_today == 50
     
+    @patch('app.email.gmail_api.time.sleep')
+    @patch('app.email.gmail_api.time.monotonic')
+    def test_wait_if_needed_paces_by_batch_size(self, mock_monotonic, mock_sleep):
+        """Test a batch waits for its own size before going out."""
+        limiter = GmailRateLimiter(daily_limit=100, rate_limit=60)
+        mock_monotonic.return_value = 100.0
+        
+        limiter.wait_if_needed(1)
+        mock_sleep.assert_not_called()
+        
+        limiter.wait_if_needed(10)
+        mock_sleep.assert_called_once_with(10.0)
+    
     def test_can_send_email_exceeds_limit(self):
         """Test email sending when exceeding daily limit."""
         limiter = GmailRateLimiter(daily_limit=10, rate_limit=5)
@@ -108,14 +145,14 @@ class TestGmailRateLimiter:
         
         assert limiter.sent_today == 5
         
-        # Simulate new day by changing last_reset
-        from datetime import date, timedelta
-        limiter.last_reset = date.today() - timedelta(days=1)
+        # Simulate new day by moving the start of the quota day back
+        limiter._day_start -= GmailRateLimiter.SECONDS_PER_DAY
         
         # Should reset counter
         assert limiter.can_send_email() is True
         # After checking, counter should be reset
         assert limiter.sent_today == 0
+        assert limiter.last_reset == datetime.utcnow().date()
 
 
 class TestGmailService:
@@ -135,7 +172,7 @@ class TestGmailService:
     def test_send_email_success(self, mock_auth_manager, mock_build, test_config):
         """Test successful email sending."""
         # Mock credentials and service
-        mock_creds = Mock()
+        mock_creds = SimpleNamespace(valid=True, expiry=None)
         mock_auth_manager.return_value.get_credentials.return_value = mock_creds
         
         mock_gmail_service = Mock()
@@ -185,7 +222,7 @@ class TestGmailService:
         }
         
         # Mock Gmail service
-        mock_creds = Mock()
+        mock_creds = SimpleNamespace(valid=True, expiry=None)
         mock_auth_manager.return_value.get_credentials.return_value = mock_creds
         
         mock_gmail_service = Mock()
@@ -205,47 +242,149 @@ class TestGmailService:
         assert result['success'] is True
         mock_template_manager.return_value.render_template.assert_called_once()
 
+    @patch('app.email.gmail_api.build')
+    @patch('app.email.gmail_api.GmailAuthManager')
+    def test_gmail_client_shared_between_services(self, mock_auth_manager, mock_build, test_config):
+        """Test services with the same credentials reuse one built client."""
+        mock_auth_manager.return_value.get_credentials.side_effect = lambda: SimpleNamespace(
+            valid=True, expiry=None, client_id='client', refresh_token='refresh-shared'
+        )
+        
+        first = GmailService(test_config)._get_service()
+        second = GmailService(test_config)._get_service()
+        
+        assert first is second is mock_build.return_value
+        mock_build.assert_called_once()
+        assert mock_build.call_args.kwargs['cache_discovery'] is False
+    
+    @patch('app.email.gmail_api.build')
+    @patch('app.email.gmail_api.GmailAuthManager')
+    def test_send_emails_batch(self, mock_auth_manager, mock_build, test_config):
+        """Test batched sending reports per-recipient results in order."""
+        from googleapiclient.errors import HttpError
+        
+        mock_auth_manager.return_value.get_credentials.return_value = SimpleNamespace(valid=True, expiry=None)
+        mock_gmail_service = Mock()
+        mock_build.return_value = mock_gmail_service
+        
+        batches = []
+        
+        class FakeBatch:
+            def __init__(self, callback):
+                self.callback = callback
+                self.request_ids = []
+                batches.append(self)
+            
+            def add(self, request, request_id):
+                self.request_ids.append(request_id)
+            
+            def execute(self):
+                for request_id in self.request_ids:
+                    if request_id == '1':
+                        self.callback(request_id, None, HttpError(Mock(status=400), b'bad recipient'))
+                    else:
+                        self.callback(request_id, {'id': f'msg-{request_id}', 'threadId': 't'}, None)
+        
+        mock_gmail_service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+        
+        service = GmailService(test_config)
+        service.BATCH_SIZE = 2
+        service.rate_limiter.rate_limit = 60000
+        messages = [
+            {'to_address': f'user{i}@acme.io', 'subject': 'Hi', 'body': 'Body'}
+            for i in range(3)
+        ]
+        
+        results = service.send_emails_batch(messages)
+        
+        assert len(batches) == 2
+        assert [r['recipient'] for r in results] == [m['to_address'] for m in messages]
+        assert [r['success'] for r in results] == [True, False, True]
+        assert results[0]['message_id'] == 'msg-0'
+        assert results[1]['error_code'] == 400
+        assert service.rate_limiter.sent_today == 2
+    
+    @patch('app.email.gmail_api.build')
+    @patch('app.email.gmail_api.GmailAuthManager')
+    def test_send_emails_batch_respects_daily_limit(self, mock_auth_manager, mock_build, test_config):
+        """Test batched sending does not queue more than the remaining quota."""
+        mock_auth_manager.return_value.get_credentials.return_value = SimpleNamespace(valid=True, expiry=None)
+        mock_batch = mock_build.return_value.new_batch_http_request.return_value
+        
+        service = GmailService(test_config)
+        service.rate_limiter.daily_limit = 1
+        messages = [
+            {'to_address': f'user{i}@acme.io', 'subject': 'Hi', 'body': 'Body'}
+            for i in range(2)
+        ]
+        
+        results = service.send_emails_batch(messages)
+        
+        assert mock_batch.add.call_count == 1
+        mock_batch.execute.assert_called_once()
+        assert results[1] == {
+            'success': False,
+            'error': 'Daily email limit exceeded',
+            'recipient': 'user1@acme.io'
+        }
+    
+    @patch('app.email.gmail_api.build')
+    @patch('app.email.gmail_api.GmailAuthManager')
+    def test_send_emails_batch_uses_configured_batch_size(self, mock_auth_manager, mock_build,
+                                                          test_config, monkeypatch):
+        """Test batch requests are split at gmail.batch_size."""
+        mock_auth_manager.return_value.get_credentials.return_value = SimpleNamespace(valid=True, expiry=None)
+        monkeypatch.setattr(test_config.email.gmail, 'batch_size', 2)
+        
+        service = GmailService(test_config)
+        service.rate_limiter.rate_limit = 60000
+        messages = [
+            {'to_address': f'user{i}@acme.io', 'subject': 'Hi', 'body': 'Body'}
+            for i in range(5)
+        ]
+        
+        service.send_emails_batch(messages)
+        
+        assert mock_build.return_value.new_batch_http_request.call_count == 3
+    
+    @patch('app.email.gmail_api.time.sleep')
+    @patch('app.email.gmail_api.build')
+    @patch('app.email.gmail_api.GmailAuthManager')
+    def test_send_emails_batch_splits_at_rate_limit(self, mock_auth_manager, mock_build,
+                                                   mock_sleep, test_config):
+        """Test no batch request holds more than a minute's rate limit."""
+        mock_auth_manager.return_value.get_credentials.return_value = SimpleNamespace(valid=True, expiry=None)
+        mock_batch = mock_build.return_value.new_batch_http_request.return_value
+        
+        service = GmailService(test_config)
+        service.rate_limiter.rate_limit = 3
+        messages = [
+            {'to_address': f'user{i}@acme.io', 'subject': 'Hi', 'body': 'Body'}
+            for i in range(7)
+        ]
+        
+        service.send_emails_batch(messages)
+        
+        assert mock_build.return_value.new_batch_http_request.call_count == 3
+        assert mock_batch.execute.call_count == 3
+        assert mock_sleep.call_count == 2
+
 
 class TestSMTPClient:
     """Test SMTP client functionality."""
     
-    def test_smtp_client_initialization(self, test_config):
+    def test_smtp_client_initialization(self, smtp_client):
         """Test SMTP client initialization."""
-        # Add SMTP config to test config
-        test_config.email.smtp = Mock(
-            host='smtp.gmail.com',
-            port=587,
-            use_tls=True,
-            username='test@example.com',
-            password='test_password'
-        )
-        
-        client = SMTPClient(test_config)
-        
-        assert client.smtp_host == 'smtp.gmail.com'
-        assert client.smtp_port == 587
-        assert client.use_tls is True
-        assert client.username == 'test@example.com'
+        assert smtp_client.smtp_host == 'smtp.gmail.com'
+        assert smtp_client.smtp_port == 587
+        assert smtp_client.use_tls is True
+        assert smtp_client.username == 'test@example.com'
     
-    @patch('smtplib.SMTP')
-    def test_send_email_success(self, mock_smtp, test_config):
+    def test_send_email_success(self, smtp_client):
         """Test successful SMTP email sending."""
-        # Add SMTP config
-        test_config.email.smtp = Mock(
-            host='smtp.gmail.com',
-            port=587,
-            use_tls=True,
-            username='test@example.com',
-            password='test_password'
-        )
+        mock_server = smtp_client._server_factory.return_value
         
-        # Mock SMTP server
-        mock_server = Mock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
-        
-        client = SMTPClient(test_config)
-        
-        result = client.send_email(
+        result = smtp_client.send_email(
             to_address='recipient@example.com',
             subject='Test Subject',
             body='Test body'
@@ -257,16 +396,54 @@ class TestSMTPClient:
         mock_server.login.assert_called_once()
         mock_server.send_message.assert_called_once()
     
-    def test_send_email_no_credentials(self, test_config):
+    def test_send_email_reuses_connection(self, smtp_client):
+        """Test STARTTLS and LOGIN happen once across several sends."""
+        mock_server = smtp_client._server_factory.return_value
+        
+        for i in range(3):
+            result = smtp_client.send_email(
+                to_address=f'recipient{i}@example.com',
+                subject='Test Subject',
+                body='Test body'
+            )
+            assert result['success'] is True
+        
+        smtp_client._server_factory.assert_called_once()
+        assert mock_server.starttls.call_count == 1
+        assert mock_server.login.call_count == 1
+        assert mock_server.send_message.call_count == 3
+    
+    def test_send_email_reconnects_after_disconnect(self, smtp_client):
+        """Test a dropped connection is replaced on the next send."""
+        mock_server = smtp_client._server_factory.return_value
+        
+        smtp_client.send_email('first@example.com', 'Subject', 'Body')
+        mock_server.noop.side_effect = [smtplib.SMTPServerDisconnected()]
+        result = smtp_client.send_email('second@example.com', 'Subject', 'Body')
+        
+        assert result['success'] is True
+        assert smtp_client._server_factory.call_count == 2
+        assert mock_server.login.call_count == 2
+    
+    def test_send_bulk(self, smtp_client):
+        """Test bulk sending over a single connection."""
+        messages = [
+            {'to_address': f'recipient{i}@example.com', 'subject': 'Subject', 'body': 'Body'}
+            for i in range(3)
+        ]
+        
+        results = smtp_client.send_bulk(messages)
+        
+        assert [r['recipient'] for r in results] == [m['to_address'] for m in messages]
+        assert all(r['success'] for r in results)
+        smtp_client._server_factory.assert_called_once()
+    
+    def test_send_email_no_credentials(self, test_config, monkeypatch):
         """Test SMTP email sending without credentials."""
-        # No SMTP config
-        test_config.email.smtp = Mock(
-            host='smtp.gmail.com',
-            port=587,
-            use_tls=True,
-            username='',
-            password=''
-        )
+        # No SMTP credentials
+        monkeypatch.setattr(test_config.email.smtp, 'username', '')
+        monkeypatch.setattr(test_config.email.smtp, 'password', '')
+        monkeypatch.delenv('SMTP_PASSWORD', raising=False)
         
         client = SMTPClient(test_config)
         
@@ -340,6 +517,69 @@ class TestEmailServiceManager:
         assert result['success'] is True
         assert result['fallback_used'] is True
         assert result['method'] == 'smtp'
+    
+    @patch('app.email.smtp_client.SMTPClient')
+    @patch('app.email.gmail_api.GmailService')
+    def test_send_bulk_sendgrid_groups_by_body(self, mock_gmail_class, mock_smtp_class, test_config):
+        """Test SendGrid bulk sends use one request per distinct body."""
+        mock_sendgrid = Mock()
+        mock_sendgrid.send_email_to_many.side_effect = lambda recipients, **kwargs: [
+            {'success': True, 'recipient': recipient} for recipient in recipients
+        ]
+        
+        manager = EmailServiceManager(test_config)
+        manager.primary_service = 'sendgrid'
+        manager.sendgrid_service = mock_sendgrid
+        
+        messages = [
+            {'to_address': 'a@acme.io', 'subject': 'Hi A', 'body': 'Hello'},
+            {'to_address': 'b@acme.io', 'subject': 'Update', 'body': 'Other'},
+            {'to_address': 'c@acme.io', 'subject': 'Hi C', 'body': 'Hello'},
+        ]
+        
+        results = manager.send_bulk(messages)
+        
+        calls = mock_sendgrid.send_email_to_many.call_args_list
+        assert len(calls) == 2
+        assert calls[0][0][0] == ['a@acme.io', 'c@acme.io']
+        assert calls[0][1]['subjects'] == ['Hi A', 'Hi C']
+        assert [r['recipient'] for r in results] == ['a@acme.io', 'b@acme.io', 'c@acme.io']
+        mock_gmail_class.return_value.send_emails_batch.assert_not_called()
+
+
+class TestSendGridClient:
+    """Test SendGrid client functionality."""
+    
+    @patch('app.email.sendgrid_client.sendgrid.SendGridAPIClient')
+    @patch('app.email.sendgrid_client.get_config')
+    def test_send_email_to_many(self, mock_get_config, mock_api_client, test_config, monkeypatch):
+        """Test one request carries a personalization per recipient."""
+        from app.email.sendgrid_client import SendGridClient
+        
+        monkeypatch.setattr(test_config.email, 'sendgrid_api_key', 'test-key')
+        mock_get_config.return_value = test_config
+        mock_api_client.return_value.send.return_value = SimpleNamespace(
+            headers={'X-Message-Id': 'msg-1'}, status_code=202
+        )
+        
+        client = SendGridClient()
+        client.MAX_PERSONALIZATIONS = 2
+        recipients = ['a@acme.io', 'b@acme.io', 'c@acme.io']
+        
+        results = client.send_email_to_many(recipients, subject='Report', html_content='<p>Hi</p>')
+        
+        sends = mock_api_client.return_value.send.call_args_list
+        assert len(sends) == 2
+        assert len(sends[0][0][0].get()['personalizations']) == 2
+        assert [r['recipient'] for r in results] == recipients
+        assert all(r['success'] and r['message_id'] == 'msg-1' for r in results)
+        
+        # Per-recipient subjects land on each personalization
+        mock_api_client.return_value.send.reset_mock()
+        client.send_email_to_many(recipients, subject='Report', html_content='<p>Hi</p>',
+                                  subjects=['One', 'Two', 'Three'])
+        sends = mock_api_client.return_value.send.call_args_list
+        assert [p['subject'] for p in sends[1][0][0].get()['personalizations']] == ['Three']
 
 
 class TestEmailTemplateManager:
@@ -352,21 +592,15 @@ class TestEmailTemplateManager:
         assert manager.template_dir == str(temp_dir)
         assert manager.env is not None
     
-    def test_render_template_basic(self, temp_dir, sample_email_template):
+    def test_render_template_basic(self, template_manager):
         """Test basic template rendering."""
-        # Create template file
-        template_path = temp_dir / 'test_template.html'
-        template_path.write_text(sample_email_template['html_body'])
-        
-        manager = EmailTemplateManager(template_dir=str(temp_dir))
-        
         context = {
             'recipient_name': 'John Doe',
             'company_name': 'Test Corp',
             'sender_name': 'Jane Smith'
         }
         
-        result = manager.render_template('test_template', context)
+        result = template_manager.render_template('test_template', context)
         
         assert 'subject' in result
         assert 'html_body' in result
@@ -374,29 +608,66 @@ class TestEmailTemplateManager:
         assert 'John Doe' in result['html_body']
         assert 'Test Corp' in result['html_body']
     
-    def test_render_template_with_subject_comment(self, temp_dir):
-        """Test template rendering with subject in comment."""
-        template_content = """
-        <!-- SUBJECT: Hello {{ recipient_name }}! -->
-        <html>
-        <body>
-            <h1>Hello {{ recipient_name }}!</h1>
-            <p>Welcome to {{ company_name }}.</p>
-        </body>
-        </html>
-        """
+    def test_render_template_uses_cache(self, template_manager):
+        """Test repeated renders do not go back to the filesystem."""
+        context = {'recipient_name': 'John Doe'}
         
-        template_path = temp_dir / 'test_subject.html'
-        template_path.write_text(template_content)
+        template_manager.render_template('test_template', context)
         
-        manager = EmailTemplateManager(template_dir=str(temp_dir))
+        with patch('os.path.getmtime') as mock_getmtime, \
+                patch.object(template_manager.env.loader, 'get_source') as mock_get_source:
+            result = template_manager.render_template('test_template', context)
+        
+        assert 'John Doe' in result['html_body']
+        mock_getmtime.assert_not_called()
+        mock_get_source.assert_not_called()
+    
+    def test_render_template_does_not_recompile(self, template_manager):
+        """Test the shared environment compiles each template only once."""
+        template_manager.render_template('test_subject', {'recipient_name': 'Bob'})
+        
+        with patch.object(template_manager.env, 'compile', wraps=template_manager.env.compile) as mock_compile:
+            for name in ('Alice', 'Bob', 'Carol'):
+                result = template_manager.render_template('test_subject', {'recipient_name': name})
+                assert result['subject'] == f'Hello {name}!'
+        
+        mock_compile.assert_not_called()
+    
+    def test_render_template_memoises_output(self, template_manager):
+        """Test identical contexts reuse rendered output and results are copies."""
+        context = {'recipient_name': 'Dana', 'company_name': 'Cache Co'}
+        
+        first = template_manager.render_template('test_template', context)
+        first['html_body'] = 'modified by caller'
+        
+        with patch.object(template_manager.env, 'get_template') as mock_get_template:
+            second = template_manager.render_template('test_template', dict(context))
+        
+        mock_get_template.assert_not_called()
+        assert 'Dana' in second['html_body']
+        assert 'Cache Co' in second['html_body']
+    
+    def test_render_template_skips_cache_for_mutable_context(self, template_manager):
+        """Test contexts with mutable values are always rendered fresh."""
+        context = {'recipient_name': 'Eve', 'tags': ['a', 'b']}
+        
+        template_manager.render_template('test_template', context)
         
+        with patch.object(template_manager.env, 'get_template',
+                          wraps=template_manager.env.get_template) as mock_get_template:
+            result = template_manager.render_template('test_template', context)
+        
+        mock_get_template.assert_called_once_with('test_template.html')
+        assert 'Eve' in result['html_body']
+    
+    def test_render_template_with_subject_comment(self, template_manager):
+        """Test template rendering with subject in comment."""
         context = {
             'recipient_name': 'Alice',
             'company_name': 'Example Inc'
         }
         
-        result = manager.render_template('test_subject', context)
+        result = template_manager.render_template('test_subject', context)
         
         assert result['subject'] == 'Hello Alice!'
         assert 'Alice' in result['html_body']
@@ -423,6 +694,24 @@ class TestEmailTemplateManager:
         assert 'template2.html' in templates
         assert 'not_template.txt' not in templates
     
+    def test_list_templates_cached_until_directory_changes(self, temp_dir):
+        """Test the template listing is only rescanned when the directory changes."""
+        import os
+        
+        manager = EmailTemplateManager(template_dir=str(temp_dir))
+        before = manager.list_templates()
+        
+        with patch('os.scandir', wraps=os.scandir) as mock_scandir:
+            assert manager.list_templates() == before
+            mock_scandir.assert_not_called()
+        
+        (temp_dir / 'added.html').write_text('<html>Added</html>')
+        # Make the directory mtime change even on coarse-grained filesystems
+        stat = os.stat(temp_dir)
+        os.utime(temp_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert manager.list_templates() == sorted(before + ['added.html'])
+    
     def test_validate_template(self, temp_dir, sample_email_template):
         """Test template validation."""
         template_path = temp_dir / 'valid_template.html'
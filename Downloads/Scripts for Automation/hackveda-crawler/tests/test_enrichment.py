@@ -34,7 +34,7 @@ class TestContactExtractor:
         """
         
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup('<html></html>', 'html.parser')
+        soup = BeautifulSoup('<html></html>', 'lxml')
         
         emails = extractor._extract_emails(text, soup)
         
@@ -59,7 +59,7 @@ class TestContactExtractor:
         """
         
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_with_mailto, 'html.parser')
+        soup = BeautifulSoup(html_with_mailto, 'lxml')
         
         emails = extractor._extract_emails('', soup)
         
@@ -68,27 +68,48 @@ class TestContactExtractor:
         # noreply emails should be filtered out by validation
         assert 'noreply@example.com' not in emails
     
-    def test_extract_contact_pages(self, test_config, sample_html_content):
-        """Test contact page URL extraction."""
+    def test_extract_emails_from_mailto_links_any_case(self, test_config):
+        """Test mailto links are recognised regardless of scheme case."""
         extractor = ContactExtractor(test_config)
         
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup(sample_html_content, 'html.parser')
+        soup = BeautifulSoup("""
+            <a href="MAILTO:Sales@Acme.io?subject=Hi">Sales</a>
+            <a href="/mailto:fake@acme.io">Not a mailto</a>
+        """, 'lxml')
+        
+        assert extractor._extract_emails('', soup) == ['sales@acme.io']
+    
+    def test_extract_contact_pages(self, test_config, sample_soup):
+        """Test contact page URL extraction."""
+        extractor = ContactExtractor(test_config)
         
-        contact_pages = extractor._extract_contact_pages(soup, 'https://example.com')
+        contact_pages = extractor._extract_contact_pages(sample_soup, 'https://example.com')
         
         # Should find contact and about links
         assert any('contact' in url.lower() for url in contact_pages)
         assert any('about' in url.lower() for url in contact_pages)
     
-    def test_extract_social_links(self, test_config, sample_html_content):
-        """Test social media link extraction."""
+    def test_extract_contact_pages_matches_link_text(self, test_config):
+        """Test contact pages are found by link text as well as href."""
         extractor = ContactExtractor(test_config)
         
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup(sample_html_content, 'html.parser')
+        soup = BeautifulSoup("""
+            <a href="/p/42">Get in <b>Touch</b></a>
+            <a href="/Contact-Us">Write</a>
+            <a href="/pricing">Pricing</a>
+        """, 'lxml')
         
-        social_links = extractor._extract_social_links(soup)
+        contact_pages = extractor._extract_contact_pages(soup, 'https://acme.io')
+        
+        assert sorted(contact_pages) == ['https://acme.io/Contact-Us', 'https://acme.io/p/42']
+    
+    def test_extract_social_links(self, test_config, sample_soup):
+        """Test social media link extraction."""
+        extractor = ContactExtractor(test_config)
+        
+        social_links = extractor._extract_social_links(sample_soup)
         
         assert 'twitter' in social_links
         assert 'linkedin' in social_links
@@ -112,6 +133,52 @@ class TestContactExtractor:
         assert any('234' in phone for phone in phone_numbers)
         assert any('555' in phone for phone in phone_numbers)
     
+    def test_text_patterns_skipped_when_not_matched(self, test_config):
+        """Test that patterns ruled out by the prefilter are not run."""
+        extractor = ContactExtractor(test_config)
+        
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup('<html></html>', 'lxml')
+        text = 'Write to sales@acme.io or call 555-123-4567.'
+        phone_offset = len(extractor.email_patterns)
+        
+        assert extractor._extract_emails(text, soup, matched=set()) == []
+        assert extractor._extract_emails(text, soup, matched={0}) == ['sales@acme.io']
+        assert extractor._extract_phone_numbers(text, matched=set()) == []
+        assert extractor._extract_phone_numbers(text, matched={phone_offset}) == ['555-123-4567']
+        
+        matched = extractor._match_text_patterns(text)
+        if matched is not None:
+            assert 0 in matched
+            assert phone_offset in matched
+        assert extractor._match_text_patterns('') is None
+    
+    def test_text_prefilter_skipped_for_unicode_text(self, test_config):
+        """Test text RE2 would read differently from re bypasses the prefilter."""
+        extractor = ContactExtractor(test_config)
+        
+        # NBSP from &nbsp; is whitespace to re but not to RE2
+        text = 'Call (555)\xa0123-4567'
+        matched = extractor._match_text_patterns(text)
+        
+        assert matched is None
+        assert extractor._extract_phone_numbers(text, matched) == ['(555)\xa0123-4567']
+        assert extractor._match_text_patterns('Call\x0b555-123-4567') is None
+    
+    def test_extract_addresses(self, test_config):
+        """Test address extraction matches the re pattern whichever engine runs it."""
+        from app.enrichment.contact_extractor import _ADDRESS_RE
+        extractor = ContactExtractor(test_config)
+        
+        text = 'Visit 123 Main Street, Springfield, IL 62704 today.\n' + 'lorem ipsum 42 ' * 50
+        
+        assert extractor._extract_addresses(text) == list(set(_ADDRESS_RE.findall(text)))
+        assert extractor._extract_addresses('No address here') == []
+        
+        # NBSP is whitespace to re but not to RE2
+        nbsp_address = '123\xa0Main Street, Springfield, IL 62704'
+        assert extractor._extract_addresses(nbsp_address) == [nbsp_address]
+    
     def test_is_valid_email(self, test_config):
         """Test email validation."""
         extractor = ContactExtractor(test_config)
@@ -184,6 +251,35 @@ class TestContactExtractor:
         assert contact_info.extraction_method == 'page_analysis'
         assert contact_info.source_urls == [page_content.url]
     
+    def test_extract_contacts_from_page_parses_only_links(self, test_config):
+        """Test that anchors nested in other markup survive the link-only parse."""
+        extractor = ContactExtractor(test_config)
+        
+        page_content = PageContent(
+            url='https://acme.io',
+            title='Acme',
+            content='Acme widgets',
+            html="""
+            <html><head><script>var x = 1;</script></head>
+            <body><table><tr><td>
+                <a href="mailto:sales@acme.io">Sales</a>
+                <a href="/contact">Contact</a>
+                <a href="https://github.com/acme">GitHub</a>
+                <a name="top">No href</a>
+            </td></tr></table></body></html>
+            """,
+            status_code=200,
+            response_time=1.0,
+            headers={},
+            fetch_timestamp=None
+        )
+        
+        contact_info = extractor.extract_contacts_from_page(page_content)
+        
+        assert contact_info.emails == ['sales@acme.io']
+        assert 'https://acme.io/contact' in contact_info.contact_pages
+        assert contact_info.social_links == {'github': 'https://github.com/acme'}
+    
     @patch('app.enrichment.contact_extractor.PageFetcher')
     def test_extract_contacts_from_domain(self, mock_page_fetcher_class, test_config, sample_html_content):
         """Test contact extraction from entire domain."""
@@ -214,6 +310,57 @@ class TestContactExtractor:
         # Should have called fetch_page multiple times
         assert mock_page_fetcher.fetch_page.call_count >= 1
     
+    def test_extract_contacts_from_domain_concurrent_fetch(self, test_config):
+        """Test pages are fetched concurrently, in order, and failures are skipped."""
+        import threading
+        
+        # Every fetch waits for the others, which only succeeds if they overlap
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def fetch_page(url):
+            barrier.wait()
+            if url.endswith('/contact-us'):
+                raise ConnectionError('boom')
+            return PageContent(
+                url=url, title='', content='', html='<a href="/about">About</a>',
+                status_code=200, response_time=0.1, headers={}, fetch_timestamp=None
+            )
+        
+        extractor = ContactExtractor(test_config)
+        extractor.page_fetcher = Mock()
+        extractor.page_fetcher.fetch_page.side_effect = fetch_page
+        
+        contact_info = extractor.extract_contacts_from_domain('acme.io', max_pages=3)
+        
+        assert contact_info.source_urls == ['https://acme.io', 'https://acme.io/contact']
+        assert extractor.page_fetcher.fetch_page.call_count == 3
+    
+    def test_extract_contacts_from_domains_async(self, test_config):
+        """Test several domains are crawled concurrently and returned in order."""
+        import asyncio
+        import threading
+        
+        # Each domain's homepage waits for the other, which only succeeds if they overlap
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def fetch_page(url):
+            barrier.wait()
+            return PageContent(
+                url=url, title='', content=f'Write to info@{url[8:]}', html='<p></p>',
+                status_code=200, response_time=0.1, headers={}, fetch_timestamp=None
+            )
+        
+        extractor = ContactExtractor(test_config)
+        extractor.page_fetcher = Mock()
+        extractor.page_fetcher.fetch_page.side_effect = fetch_page
+        
+        results = asyncio.run(extractor.extract_contacts_from_domains_async(
+            ['acme.io', 'globex.io'], max_pages=1
+        ))
+        
+        assert [r.source_urls for r in results] == [['https://acme.io'], ['https://globex.io']]
+        assert [r.emails for r in results] == [['info@acme.io'], ['info@globex.io']]
+    
     def test_calculate_confidence_score(self, test_config, sample_html_content):
         """Test confidence score calculation."""
         extractor = ContactExtractor(test_config)
@@ -272,6 +419,19 @@ class TestContactExtractor:
             elif expected_quality == 'low':
                 assert enrichment['quality_score'] < 0.4
     
+    def test_enrich_domain_info_tld_lookup(self, test_config):
+        """Test quality bonus comes from the TLD label, not a substring."""
+        extractor = ContactExtractor(test_config)
+        
+        assert extractor.enrich_domain_info('NEWS.ORG')['quality_score'] == pytest.approx(0.8)
+        assert extractor.enrich_domain_info('dept.gov.uk')['quality_score'] == pytest.approx(0.8)
+        assert extractor.enrich_domain_info('my.organic.io')['quality_score'] == pytest.approx(0.5)
+        
+        enrichment = extractor.enrich_domain_info('localhost')
+        assert enrichment['tld'] == ''
+        assert enrichment['main_domain'] == 'localhost'
+        assert enrichment['is_subdomain'] is False
+    
     def test_extract_contacts_empty_page(self, test_config):
         """Test contact extraction from empty page."""
         extractor = ContactExtractor(test_config)
@@ -325,7 +485,7 @@ class TestContactExtractor:
         """
         
         from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_with_social, 'html.parser')
+        soup = BeautifulSoup(html_with_social, 'lxml')
         
         social_links = extractor._extract_social_links(soup)
         
@@ -340,6 +500,21 @@ class TestContactExtractor:
         # Should not include non-social media links
         assert 'not-social-media.com' not in social_links.values()
     
+    def test_social_links_match_on_host_only(self, test_config):
+        """Test that platform names outside the link host are ignored."""
+        extractor = ContactExtractor(test_config)
+        
+        html = """
+        <a href="https://example.com/share?url=https://twitter.com/acme">Share</a>
+        <a href="https://m.facebook.com/acme">Mobile</a>
+        <a href="HTTPS://WWW.GitHub.com/acme">GitHub</a>
+        """
+        
+        from bs4 import BeautifulSoup
+        social_links = extractor._extract_social_links(BeautifulSoup(html, 'lxml'))
+        
+        assert social_links == {'github': 'HTTPS://WWW.GitHub.com/acme'}
+    
     def test_phone_number_patterns(self, test_config):
         """Test various phone number format recognition."""
         extractor = ContactExtractor(test_config)
@@ -396,3 +571,4 @@ class TestContactExtractor:
         assert isinstance(contact_info.social_links, dict)
         assert isinstance(contact_info.phone_numbers, list)
         assert isinstance(contact_info.addresses, list)
+        assert not hasattr(contact_info, '__dict__')
@@ -3,6 +3,7 @@ Integration tests for HackVeda Crawler.
 Tests end-to-end functionality and component integration.
 """
 
+import asyncio
 import pytest
 import responses
 from unittest.mock import Mock, patch, MagicMock
@@ -26,7 +27,7 @@ class TestCrawlerIntegration:
         responses.add(
             responses.GET,
             'https://www.google.com/search',
-            html=mock_google_search_response,
+            body=mock_google_search_response,
             status=200
         )
         
@@ -43,7 +44,7 @@ class TestCrawlerIntegration:
         
         # Verify results
         assert len(results) == 2
-        assert all(result.metadata.get('keyword') == 'test query' for result in results)
+        assert all(result.result_metadata.get('keyword') == 'test query' for result in results)
         
         # Simulate storing in database
         from app.database.db import CrawlSessionRepository, SearchResultRepository
@@ -59,19 +60,23 @@ class TestCrawlerIntegration:
         )
         
         # Store results
-        for result in results:
-            search_result = result_repo.create(
-                crawl_session_id=crawl_session.id,
-                title=result.title,
-                url=result.url,
-                snippet=result.snippet,
-                rank=result.rank,
-                domain=result.domain,
-                source_keyword=result.metadata.get('keyword', '')
-            )
+        stored_results = result_repo.bulk_create([
+            {
+                'crawl_session_id': crawl_session.id,
+                'title': result.title,
+                'url': result.url,
+                'snippet': result.snippet,
+                'rank': result.rank,
+                'domain': result.domain,
+                'source_keyword': result.result_metadata.get('keyword', '')
+            }
+            for result in results
+        ])
         
         # Verify database operations were called
-        assert mock_session.add.call_count >= len(results) + 1  # results + session
+        assert len(stored_results) == len(results)
+        mock_session.add.assert_called_once_with(crawl_session)
+        mock_session.add_all.assert_called_once_with(stored_results)
     
     @responses.activate
     @patch('app.enrichment.contact_extractor.PageFetcher')
@@ -188,8 +193,148 @@ class TestEmailIntegration:
         assert result['total_recipients'] == len(mock_contacts)
         assert 'results' in result
         
-        # Verify Gmail API was called for each contact
-        assert mock_gmail_service.users().messages().send().execute.call_count == len(mock_contacts)
+        # Verify every contact went out in a single Gmail batch request
+        mock_batch = mock_gmail_service.new_batch_http_request.return_value
+        assert mock_batch.add.call_count == len(mock_contacts)
+        mock_batch.execute.assert_called_once()
+    
+    @patch('app.jobs.scheduler.EmailServiceManager')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_email_campaign_commits_each_batch(self, mock_get_db_manager, mock_email_service_class,
+                                               test_config):
+        """Test a failing batch neither aborts the campaign nor undoes earlier batches."""
+        mock_session = Mock()
+        mock_get_db_manager.return_value.get_session.return_value.__enter__.return_value = mock_session
+        
+        from app.database.models import EmailCampaign, Contact
+        campaign = EmailCampaign(
+            id=1, name='Test Campaign', subject_template='Hello',
+            from_address='test@example.com', emails_sent=0, emails_failed=0
+        )
+        contacts = [
+            Contact(id=1, email='a@acme.io', company='Acme', email_status='new'),
+            Contact(id=2, email='b@acme.io', company='Acme', email_status='new')
+        ]
+        mock_session.query.return_value.filter.return_value.first.return_value = campaign
+        mock_session.query.return_value.filter.return_value.all.return_value = contacts
+        
+        # The second batch blows up inside the email service
+        mock_email_service_class.return_value.send_bulk.side_effect = [
+            [{'success': True, 'message_id': 'msg-1'}],
+            RuntimeError('SMTP down')
+        ]
+        
+        email_job = EmailJob(test_config)
+        email_job.SEND_BATCH_SIZE = 1
+        result = email_job.execute(campaign_id=1)
+        
+        assert result['emails_sent'] == 1
+        assert result['emails_failed'] == 1
+        assert result['results'][1] == {
+            'contact_id': 2, 'email': 'b@acme.io', 'success': False, 'error': 'SMTP down'
+        }
+        assert contacts[0].email_status == 'contacted'
+        assert contacts[1].email_status == 'new'
+        
+        # Each batch's log rows are inserted and committed before the next batch
+        calls = [name for name, _, _ in mock_session.mock_calls if name in ('execute', 'commit')]
+        assert calls == ['execute', 'commit', 'execute', 'commit', 'commit']
+    
+    @patch('app.jobs.scheduler.time.sleep')
+    @patch('app.jobs.scheduler.EmailServiceManager')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_email_campaign_paces_each_message_without_gmail(self, mock_get_db_manager,
+                                                             mock_email_service_class,
+                                                             mock_sleep, test_config):
+        """Test SMTP/SendGrid campaigns keep the campaign rate between single sends."""
+        mock_session = Mock()
+        mock_get_db_manager.return_value.get_session.return_value.__enter__.return_value = mock_session
+        
+        from app.database.models import EmailCampaign, Contact
+        campaign = EmailCampaign(
+            id=1, name='Test Campaign', subject_template='Hello', send_rate_limit=10,
+            from_address='test@example.com', emails_sent=0, emails_failed=0
+        )
+        contacts = [
+            Contact(id=i, email=f'user{i}@acme.io', company='Acme', email_status='new')
+            for i in range(3)
+        ]
+        mock_session.query.return_value.filter.return_value.first.return_value = campaign
+        mock_session.query.return_value.filter.return_value.all.return_value = contacts
+        
+        mock_email_service = mock_email_service_class.return_value
+        mock_email_service.uses_gmail_batches = False
+        mock_email_service.send_bulk.side_effect = lambda messages: [{'success': True} for _ in messages]
+        
+        result = EmailJob(test_config).execute(campaign_id=1)
+        
+        assert result['emails_sent'] == 3
+        assert [len(c.args[0]) for c in mock_email_service.send_bulk.call_args_list] == [1, 1, 1]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [6.0, 6.0]
+    
+    @patch('app.jobs.scheduler.EmailServiceManager')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_email_campaign_fails_messages_missing_from_results(self, mock_get_db_manager,
+                                                                mock_email_service_class, test_config):
+        """Test messages send_bulk returned no result for are logged as failed."""
+        mock_session = Mock()
+        mock_get_db_manager.return_value.get_session.return_value.__enter__.return_value = mock_session
+        
+        from app.database.models import EmailCampaign, Contact
+        campaign = EmailCampaign(
+            id=1, name='Test Campaign', subject_template='Hello',
+            from_address='test@example.com', emails_sent=0, emails_failed=0
+        )
+        contacts = [
+            Contact(id=1, email='a@acme.io', company='Acme', email_status='new'),
+            Contact(id=2, email='b@acme.io', company='Acme', email_status='new')
+        ]
+        mock_session.query.return_value.filter.return_value.first.return_value = campaign
+        mock_session.query.return_value.filter.return_value.all.return_value = contacts
+        
+        mock_email_service_class.return_value.send_bulk.return_value = [{'success': True}]
+        
+        result = EmailJob(test_config).execute(campaign_id=1)
+        
+        assert result['emails_sent'] == 1
+        assert result['emails_failed'] == 1
+        assert result['results'][1]['success'] is False
+        assert len(mock_session.execute.call_args[0][1]) == 2
+    
+    @patch('app.jobs.scheduler.time.sleep')
+    @patch('app.jobs.scheduler.EmailServiceManager')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_bulk_emails_space_each_message_without_gmail(self, mock_get_db_manager,
+                                                          mock_email_service_class,
+                                                          mock_sleep, test_config):
+        """Test templated bulk sends keep their gap between single SMTP/SendGrid sends."""
+        mock_email_service = mock_email_service_class.return_value
+        mock_email_service.uses_gmail_batches = False
+        mock_email_service.send_bulk.side_effect = lambda messages: [{'success': True} for _ in messages]
+        
+        recipients = [{'email': f'user{i}@acme.io'} for i in range(3)]
+        result = EmailJob(test_config).execute(template_name='welcome', recipients=recipients)
+        
+        assert result['emails_sent'] == 3
+        assert mock_email_service.send_bulk.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [EmailJob.BULK_SEND_INTERVAL] * 2
+    
+    @patch('app.jobs.scheduler.time.sleep')
+    @patch('app.jobs.scheduler.EmailServiceManager')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_bulk_emails_fail_messages_missing_from_results(self, mock_get_db_manager,
+                                                            mock_email_service_class,
+                                                            mock_sleep, test_config):
+        """Test a short send_bulk result list marks the rest as failed."""
+        mock_email_service_class.return_value.send_bulk.return_value = [{'success': True}]
+        
+        recipients = [{'email': 'a@acme.io'}, {'email': 'b@acme.io'}]
+        result = EmailJob(test_config).execute(template_name='welcome', recipients=recipients)
+        
+        assert result['emails_sent'] == 1
+        assert result['emails_failed'] == 1
+        assert result['results'][1]['email'] == 'b@acme.io'
+        assert result['results'][1]['success'] is False
     
     @patch('app.email.templates.EmailTemplateManager')
     @patch('app.email.gmail_api.build')
@@ -271,6 +416,40 @@ class TestJobSchedulerIntegration:
         assert result['keywords'] == ['test query']
         assert result['total_results'] >= 0
     
+    @patch('app.jobs.scheduler.GoogleSERPCrawler')
+    @patch('app.jobs.scheduler.get_db_manager')
+    def test_crawl_job_bulk_inserts_results(self, mock_get_db_manager, mock_crawler_class, test_config):
+        """Test crawl job stores all results with one bulk insert."""
+        mock_session = Mock()
+        mock_get_db_manager.return_value.get_session.return_value.__enter__.return_value = mock_session
+        
+        from app.crawler.google_serp import SearchResult
+        from app.database.db import SearchResultRepository
+        count = SearchResultRepository.BULK_INSERT_THRESHOLD + 1
+        mock_crawler_class.return_value.crawl_keywords.return_value = [
+            SearchResult(
+                title=f'Result {i}', url=f'https://site{i}.com', snippet='Snippet',
+                rank=i + 1, domain=f'site{i}.com', crawl_timestamp=datetime.now(),
+                response_time=0.5, result_metadata={'keyword': 'test query'}
+            )
+            for i in range(count)
+        ]
+        mock_session.execute.return_value.scalars.return_value.all.return_value = list(range(1, count + 1))
+        
+        result = CrawlJob(test_config).execute(keywords=['test query'], max_results=count)
+        
+        assert result['total_results'] == count
+        assert result['results_by_keyword'] == {'test query': count}
+        
+        # One executemany INSERT for every row, nothing added row by row
+        mock_session.execute.assert_called_once()
+        rows = mock_session.execute.call_args[0][1]
+        assert len(rows) == count
+        assert rows[0]['url'] == 'https://site0.com'
+        assert rows[0]['source_keyword'] == 'test query'
+        mock_session.add_all.assert_not_called()
+        mock_session.commit.assert_called_once()
+    
     @patch('app.email.gmail_api.build')
     @patch('app.email.gmail_api.GmailAuthManager')
     @patch('app.database.db.DatabaseManager')
@@ -318,6 +497,9 @@ class TestJobSchedulerIntegration:
         assert result['success'] is True
         assert result['total_recipients'] == len(recipients)
         assert result['emails_sent'] >= 0
+        
+        # Both recipients go out in one Gmail batch request
+        mock_gmail_service.new_batch_http_request.assert_called_once()
     
     def test_job_scheduler_lifecycle(self, test_config):
         """Test job scheduler start/stop lifecycle."""
@@ -328,7 +510,7 @@ class TestJobSchedulerIntegration:
         
         # Start scheduler
         scheduler.start()
-        assert scheduler.is_running() is True
+        assert scheduler.wait_running(2.0) is True
         
         # Add a test job
         scheduler.add_interval_job(
@@ -395,9 +577,17 @@ class TestEndToEndWorkflow:
         mock_auth_manager.return_value.get_credentials.return_value = mock_creds
         
         mock_gmail_service = Mock()
-        mock_gmail_service.users().messages().send().execute.return_value = {
-            'id': 'test_message_id'
-        }
+        mock_batch = Mock()
+        
+        def new_batch(callback):
+            # Answer every queued send through the batch callback
+            mock_batch.execute.side_effect = lambda: [
+                callback(call.kwargs['request_id'], {'id': 'test_message_id'}, None)
+                for call in mock_batch.add.call_args_list
+            ]
+            return mock_batch
+        
+        mock_gmail_service.new_batch_http_request.side_effect = new_batch
         mock_build.return_value = mock_gmail_service
         
         # Mock database operations
@@ -414,11 +604,11 @@ class TestEndToEndWorkflow:
         contact_extractor = ContactExtractor(test_config)
         all_contacts = []
         
-        for result in crawl_results:
-            contact_info = contact_extractor.extract_contacts_from_domain(
-                result.domain, max_pages=1
-            )
-            
+        contact_infos = asyncio.run(contact_extractor.extract_contacts_from_domains_async(
+            [result.domain for result in crawl_results], max_pages=1
+        ))
+        
+        for result, contact_info in zip(crawl_results, contact_infos):
             if contact_info.emails:
                 for email in contact_info.emails:
                     all_contacts.append({
@@ -434,21 +624,22 @@ class TestEndToEndWorkflow:
         # Step 3: Send outreach emails
         gmail_service = GmailService(test_config)
         
-        email_results = []
-        for contact in all_contacts[:2]:  # Limit to 2 for testing
-            result = gmail_service.send_email(
-                to_address=contact['email'],
-                subject=f"Partnership Opportunity with {contact['domain']}",
-                body=f"Hello! I found your contact information on {contact['source_url']} and would like to discuss a partnership opportunity."
-            )
-            email_results.append(result)
+        email_results = gmail_service.send_emails_batch([
+            {
+                'to_address': contact['email'],
+                'subject': f"Partnership Opportunity with {contact['domain']}",
+                'body': f"Hello! I found your contact information on {contact['source_url']} and would like to discuss a partnership opportunity."
+            }
+            for contact in all_contacts[:2]  # Limit to 2 for testing
+        ])
         
         # Verify emails were sent
         assert len(email_results) == min(2, len(all_contacts))
         assert all(result['success'] for result in email_results)
         
-        # Verify Gmail API was called
-        assert mock_gmail_service.users().messages().send().execute.call_count == len(email_results)
+        # Verify every email went out in a single Gmail batch request
+        assert mock_batch.add.call_count == len(email_results)
+        mock_batch.execute.assert_called_once()
     
     def test_error_handling_workflow(self, test_config):
         """Test error handling in integrated workflow."""
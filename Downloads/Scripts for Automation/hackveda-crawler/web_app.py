@@ -4,16 +4,31 @@ HackVeda Crawler - Modern Web Interface
 Beautiful, responsive web UI for the Google Crawler + Email Sender
 """
 
+try:
+    # Patch before anything below imports socket, ssl or threading
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:  # gevent is optional; the threaded Werkzeug server is used otherwise
+    monkey = None
+
 import os
 import sys
 import json
+import asyncio
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, redirect, url_for
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used otherwise
+    orjson = None
+
 # Add src to path
 sys.path.append('src')
 
@@ -23,6 +38,7 @@ from app.email.smtp_client import EmailServiceManager
 from app.crawler.google_serp import GoogleSERPCrawler
 from app.crawler.demo_crawler import DemoCrawler
 from app.email.report_generator import CrawlReportGenerator
+from app.enrichment.contact_extractor import is_valid_email_format
 
 # Initialize Flask app
 app = Flask(__name__, 
@@ -30,9 +46,24 @@ app = Flask(__name__,
            static_folder='web/static')
 app.config['SECRET_KEY'] = 'hackveda-crawler-secret-key'
 
+class OrjsonCodec:
+    """json-module stand-in that lets Socket.IO encode packets with orjson."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson output is already compact, so separators and friends are moot
+        return orjson.dumps(obj).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
 # Enable CORS and SocketIO
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio_options = {'async_mode': 'gevent' if monkey is not None else 'threading'}
+if orjson is not None:
+    socketio_options['json'] = OrjsonCodec
+socketio = SocketIO(app, cors_allowed_origins="*", **socketio_options)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,10 +73,59 @@ logger = logging.getLogger(__name__)
 config = None
 db_manager = None
 email_service = None
+crawler = None
+
+# Most recipients one bulk report request may fan out to, matching SendGrid's
+# 1000 personalizations per mail/send call
+MAX_REPORT_RECIPIENTS = 1000
+
+# Seconds the health and stats endpoints reuse the last get_stats() result
+STATS_TTL = 5.0
+_stats_cache = {'value': None, 'expires': 0.0}
+_stats_lock = threading.Lock()
+
+# Seconds between coalesced crawl_progress events
+PROGRESS_EMIT_INTERVAL = 0.25
+
+# Keywords of one crawl fetched at once
+KEYWORD_CONCURRENCY = 8
+
+# Crawls run on a fixed pool; active_crawls counts running and queued ones
+crawl_executor = None
+active_crawls = 0
+active_crawls_lock = threading.Lock()
+
+# Static debug/test pages, read once by initialize_services
+DEBUG_HTML = None
+TEST_HTML = None
+STATIC_PAGE_HEADERS = {'Cache-Control': 'public, max-age=300'}
+
+def ojson(obj, status=200):
+    """Build a JSON response, serializing datetimes natively when orjson is available."""
+    if orjson is not None:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj, default=lambda o: o.isoformat())
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def _read_page(path):
+    """Return the bytes of a static HTML page, or None if it cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        logger.warning(f"Could not load {path}: {e}")
+        return None
+
+def _static_page(body):
+    """Serve a preloaded HTML page, or 404 if it was not loaded."""
+    if body is None:
+        return 'Page not available', 404
+    return app.response_class(body, mimetype='text/html', headers=STATIC_PAGE_HEADERS)
 
 def initialize_services():
     """Initialize all services."""
-    global config, db_manager, email_service
+    global config, db_manager, email_service, crawler, crawl_executor, DEBUG_HTML, TEST_HTML
     
     try:
         # Load configuration
@@ -60,6 +140,18 @@ def initialize_services():
         email_service = EmailServiceManager(config)
         logger.info("Email service initialized")
         
+        # One demo crawler serves every request; it keeps no per-crawl state
+        crawler = DemoCrawler(config)
+        
+        # Initialize crawl worker pool
+        crawl_executor = ThreadPoolExecutor(
+            max_workers=config.app.concurrency, thread_name_prefix='crawl'
+        )
+        
+        # Preload the debug and test pages
+        DEBUG_HTML = _read_page('debug_status.html')
+        TEST_HTML = _read_page('simple_test.html')
+        
         return True
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
@@ -74,14 +166,12 @@ def dashboard():
 @app.route('/debug')
 def debug():
     """Debug page."""
-    with open('debug_status.html', 'r') as f:
-        return f.read()
+    return _static_page(DEBUG_HTML)
 
 @app.route('/test')
 def simple_test():
     """Simple test page."""
-    with open('simple_test.html', 'r') as f:
-        return f.read()
+    return _static_page(TEST_HTML)
 
 @app.route('/api/health')
 def health_check():
@@ -94,11 +184,11 @@ def health_check():
         email_results = email_service.test_services() if email_service else {}
         
         # Get database stats
-        db_stats = db_manager.get_stats() if db_manager else {}
+        db_stats = _cached_stats() if db_manager else {}
         
-        return jsonify({
+        return ojson({
             'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.utcnow(),
             'components': {
                 'database': 'healthy' if db_healthy else 'error',
                 'email_services': email_results,
@@ -106,15 +196,95 @@ def health_check():
             }
         })
     except Exception as e:
-        return jsonify({
+        return ojson({
             'status': 'error',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
-        }), 500
+            'timestamp': datetime.utcnow()
+        }, status=500)
+
+def _cached_stats():
+    """Return db_manager.get_stats(), reusing a fresh result for STATS_TTL seconds."""
+    # Holding the lock while querying lets concurrent pollers share one refresh
+    with _stats_lock:
+        now = time.monotonic()
+        if _stats_cache['value'] is None or now >= _stats_cache['expires']:
+            stats = db_manager.get_stats()
+            if 'error' in stats:
+                return stats
+            _stats_cache['value'] = stats
+            _stats_cache['expires'] = now + STATS_TTL
+        return _stats_cache['value']
+
+def _invalidate_stats():
+    """Drop cached stats after writes the dashboard should see right away."""
+    with _stats_lock:
+        _stats_cache['value'] = None
+
+def _start_progress_flusher():
+    """Coalesce crawl_progress events to one emit per PROGRESS_EMIT_INTERVAL.
+    
+    Returns (update, stop): update(payload) records the latest progress and
+    stop() emits anything still pending and ends the flusher.
+    """
+    lock = threading.Lock()
+    state = {'latest': None, 'done': False}
+    
+    def flush():
+        # Emit under the lock so a late flush cannot overtake a newer one
+        with lock:
+            if state['latest'] is not None:
+                socketio.emit('crawl_progress', state['latest'])
+                state['latest'] = None
+    
+    def flusher():
+        while not state['done']:
+            socketio.sleep(PROGRESS_EMIT_INTERVAL)
+            flush()
+    
+    def update(payload):
+        with lock:
+            state['latest'] = payload
+    
+    def stop():
+        state['done'] = True
+        flush()
+    
+    socketio.start_background_task(flusher)
+    return update, stop
+
+def _crawl_keywords(keywords, max_results, on_keyword_done):
+    """Crawl keywords concurrently and return all results in keyword order.
+    
+    Under gevent the crawl pool's threads are greenlets sharing one OS thread,
+    which can hold only one running asyncio loop, so keywords fan out as
+    greenlets instead of on a per-crawl event loop.
+    """
+    if monkey is None:
+        return asyncio.run(crawler.crawl_keywords_async(
+            keywords, max_results, concurrency=KEYWORD_CONCURRENCY,
+            on_keyword_done=on_keyword_done
+        ))
+    
+    from gevent.pool import Pool
+    
+    def crawl_one(keyword):
+        results = crawler.crawl_keyword(keyword, max_results)
+        on_keyword_done(keyword, results)
+        return results
+    
+    batches = Pool(KEYWORD_CONCURRENCY).map(crawl_one, keywords)
+    return [result for batch in batches for result in batch]
+
+def _crawl_finished(future):
+    """Release a crawl slot once a pooled crawl task ends."""
+    global active_crawls
+    with active_crawls_lock:
+        active_crawls -= 1
 
 @app.route('/api/crawl', methods=['POST'])
 def start_crawl():
     """Start crawling operation."""
+    global active_crawls
     try:
         data = request.get_json()
         keywords = data.get('keywords', [])
@@ -127,9 +297,6 @@ def start_crawl():
         # Start crawling in background thread
         def crawl_task():
             try:
-                # Use demo crawler for reliable results
-                crawler = DemoCrawler(config)
-                
                 # Emit progress updates
                 socketio.emit('crawl_progress', {
                     'status': 'started',
@@ -137,16 +304,22 @@ def start_crawl():
                     'keywords': keywords
                 })
                 
-                all_results = []
-                for i, keyword in enumerate(keywords):
-                    socketio.emit('crawl_progress', {
+                completed = 0
+                update_progress, stop_progress = _start_progress_flusher()
+                
+                def on_keyword_done(keyword, results):
+                    nonlocal completed
+                    completed += 1
+                    update_progress({
                         'status': 'crawling',
                         'current_keyword': keyword,
-                        'progress': (i / len(keywords)) * 100
+                        'progress': (completed / len(keywords)) * 100
                     })
-                    
-                    results = crawler.crawl_keyword(keyword, max_results)
-                    all_results.extend(results)
+                
+                try:
+                    all_results = _crawl_keywords(keywords, max_results, on_keyword_done)
+                finally:
+                    stop_progress()
                 
                 # Store results in database
                 if db_manager and all_results:
@@ -161,23 +334,26 @@ def start_crawl():
                             status='completed'
                         )
                         
-                        # Store results
+                        # Store results in one bulk insert
                         result_repo = SearchResultRepository(session)
-                        for result in all_results:
-                            result_repo.create(
-                                crawl_session_id=crawl_session.id,
-                                title=result.title,
-                                url=result.url,
-                                snippet=result.snippet,
-                                rank=result.rank,
-                                domain=result.domain,
-                                crawl_timestamp=result.crawl_timestamp,
-                                response_time=result.response_time,
-                                source_keyword=result.result_metadata.get('keyword', ''),
-                                result_metadata=result.result_metadata
-                            )
+                        result_repo.insert_many([
+                            {
+                                'crawl_session_id': crawl_session.id,
+                                'title': result.title,
+                                'url': result.url,
+                                'snippet': result.snippet,
+                                'rank': result.rank,
+                                'domain': result.domain,
+                                'crawl_timestamp': result.crawl_timestamp,
+                                'response_time': result.response_time,
+                                'source_keyword': result.result_metadata.get('keyword', ''),
+                                'result_metadata': result.result_metadata
+                            } for result in all_results
+                        ])
                         
                         session.commit()
+                    
+                    _invalidate_stats()
                 
                 socketio.emit('crawl_complete', {
                     'status': 'completed',
@@ -190,7 +366,7 @@ def start_crawl():
                             'snippet': r.snippet,
                             'domain': r.domain,
                             'rank': r.rank
-                        } for r in all_results[:10]  # Send first 10 for preview
+                        } for r in all_results
                     ]
                 })
                 
@@ -200,10 +376,18 @@ def start_crawl():
                     'error': str(e)
                 })
         
-        # Start background thread
-        thread = threading.Thread(target=crawl_task)
-        thread.daemon = True
-        thread.start()
+        # Queue on the crawl pool, refusing new work once it is saturated
+        with active_crawls_lock:
+            if active_crawls >= config.app.max_active_crawls:
+                return jsonify({'error': 'Too many crawls in progress, try again later'}), 429
+            active_crawls += 1
+        
+        try:
+            crawl_executor.submit(crawl_task).add_done_callback(_crawl_finished)
+        except Exception:
+            with active_crawls_lock:
+                active_crawls -= 1
+            raise
         
         return jsonify({
             'status': 'started',
@@ -272,23 +456,23 @@ def database_stats():
     """Get database statistics."""
     try:
         if not db_manager:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return ojson({'error': 'Database not initialized'}, status=500)
         
-        stats = db_manager.get_stats()
-        return jsonify({
+        stats = _cached_stats()
+        return ojson({
             'status': 'success',
             'stats': stats
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, status=500)
 
 @app.route('/api/sessions')
 def get_sessions():
     """Get crawl sessions."""
     try:
         if not db_manager:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return ojson({'error': 'Database not initialized'}, status=500)
         
         sessions_data = []
         try:
@@ -304,20 +488,105 @@ def get_sessions():
                         'session_name': s.session_name,
                         'keywords': s.keywords,
                         'status': s.status,
-                        'start_time': s.start_time.isoformat() if s.start_time else None,
+                        'start_time': s.start_time,
                         'total_results': s.total_results or 0
                     })
         except Exception as e:
             logger.error(f"Error getting sessions: {e}")
             sessions_data = []
         
-        return jsonify({
+        return ojson({
             'status': 'success',
             'sessions': sessions_data
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, status=500)
+
+def _send_report(to_emails, session_id):
+    """Email the report for one crawl session to every address in to_emails.
+    
+    Returns None if the session does not exist, otherwise the report subject,
+    result count and one send result per recipient.
+    """
+    # One session covers reading the crawl, sending and logging the emails
+    with db_manager.get_session() as session:
+        from app.database.repositories import (
+            CrawlSessionRepository, SearchResultRepository, EmailLogRepository
+        )
+        
+        session_repo = CrawlSessionRepository(session)
+        result_repo = SearchResultRepository(session)
+        
+        # Get session data
+        crawl_session = session_repo.get_by_id(session_id)
+        if not crawl_session:
+            return None
+        
+        # Prepare data for report, selecting only the columns it shows
+        crawl_data = {
+            'session_name': crawl_session.session_name,
+            'keywords': crawl_session.keywords if isinstance(crawl_session.keywords, list) else [crawl_session.keywords],
+            'results': result_repo.get_summaries_by_session(session_id)
+        }
+        
+        # Prepare sender information
+        sender_info = {
+            'name': config.email.from_name or 'HackVeda User',
+            'email': config.email.from_email or 'unknown@example.com'
+        }
+        
+        # Generate beautiful email report
+        report_generator = CrawlReportGenerator()
+        email_report = report_generator.generate_report(crawl_data, sender_info)
+        
+        # send_bulk puts every recipient in one SendGrid request, or batches
+        # through the Gmail API, depending on the primary service
+        send_results = email_service.send_bulk([
+            {
+                'to_address': to_email,
+                'subject': email_report['subject'],
+                'body': email_report['text'],
+                'html_body': email_report['html']
+            } for to_email in to_emails
+        ])
+        
+        sent = [
+            (to_email, result) for to_email, result in zip(to_emails, send_results)
+            if result.get('success')
+        ]
+        
+        # Log sent emails; get_session commits once on exit
+        sent_at = datetime.now()
+        EmailLogRepository(session).insert_many([
+            {
+                'to_address': to_email,
+                'from_address': config.email.from_email,
+                'subject': email_report['subject'],
+                'status': 'sent',
+                'sent_at': sent_at,
+                'message_id': result.get('message_id')
+            } for to_email, result in sent
+        ])
+    
+    if sent:
+        _invalidate_stats()
+    
+    # Emit real-time updates to dashboard
+    for to_email, result in sent:
+        socketio.emit('email_sent', {
+            'to_email': to_email,
+            'subject': email_report['subject'],
+            'message_id': result.get('message_id'),
+            'total_results': len(crawl_data['results']),
+            'timestamp': sent_at.isoformat()
+        })
+    
+    return {
+        'subject': email_report['subject'],
+        'total_results': len(crawl_data['results']),
+        'results': send_results
+    }
 
 @app.route('/api/email/report', methods=['POST'])
 def send_crawl_report():
@@ -333,91 +602,17 @@ def send_crawl_report():
         if not db_manager:
             return jsonify({'error': 'Database not initialized'}), 500
         
-        # Get crawl session and results from database
-        with db_manager.get_session() as session:
-            from app.database.repositories import CrawlSessionRepository, SearchResultRepository
-            
-            session_repo = CrawlSessionRepository(session)
-            result_repo = SearchResultRepository(session)
-            
-            # Get session data
-            crawl_session = session_repo.get_by_id(session_id)
-            if not crawl_session:
-                return jsonify({'error': 'Crawl session not found'}), 404
-            
-            # Get results
-            results = result_repo.get_by_session(session_id)
-            
-            # Prepare data for report
-            crawl_data = {
-                'session_name': crawl_session.session_name,
-                'keywords': crawl_session.keywords if isinstance(crawl_session.keywords, list) else [crawl_session.keywords],
-                'results': [
-                    {
-                        'title': r.title,
-                        'url': r.url,
-                        'snippet': r.snippet,
-                        'domain': r.domain,
-                        'rank': r.rank
-                    } for r in results
-                ]
-            }
-        
-        # Prepare sender information
-        sender_info = {
-            'name': config.email.from_name or 'HackVeda User',
-            'email': config.email.from_email or 'unknown@example.com'
-        }
-        
-        # Generate beautiful email report
-        report_generator = CrawlReportGenerator()
-        email_report = report_generator.generate_report(crawl_data, sender_info)
-        
-        # Send email using SendGrid
-        if email_service.sendgrid_service and email_service.sendgrid_service.is_available():
-            result = email_service.sendgrid_service.send_email(
-                to_email=to_email,
-                subject=email_report['subject'],
-                text_content=email_report['text'],
-                html_content=email_report['html']
-            )
-        else:
-            result = email_service.send_email(
-                to_address=to_email,
-                subject=email_report['subject'],
-                body=email_report['text'],
-                html_body=email_report['html']
-            )
+        report = _send_report([to_email], session_id)
+        if report is None:
+            return jsonify({'error': 'Crawl session not found'}), 404
         
+        result = report['results'][0]
         if result.get('success'):
-            # Log email in database
-            with db_manager.get_session() as log_session:
-                from app.database.repositories import EmailLogRepository
-                email_log_repo = EmailLogRepository(log_session)
-                email_log_repo.create(
-                    to_address=to_email,
-                    from_address=config.email.from_email,
-                    subject=email_report['subject'],
-                    status='sent',
-                    sent_at=datetime.now(),
-                    message_id=result.get('message_id')
-                )
-                log_session.commit()
-            
-            # Emit real-time update to dashboard
-            socketio.emit('email_sent', {
-                'to_email': to_email,
-                'subject': email_report['subject'],
-                'message_id': result.get('message_id'),
-                'total_results': len(crawl_data['results']),
-                'timestamp': datetime.now().isoformat()
-            })
-            
             return jsonify({
                 'success': True,
                 'message': f'Crawl report sent successfully to {to_email}',
                 'message_id': result.get('message_id'),
-                'total_results': len(crawl_data['results'])
+                'total_results': report['total_results']
             })
         else:
             return jsonify({
@@ -428,6 +623,57 @@ def send_crawl_report():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/email/report/bulk', methods=['POST'])
+def send_crawl_report_bulk():
+    """Send one crawl report to several recipients."""
+    try:
+        data = request.get_json()
+        to_emails = data.get('to_emails')
+        session_id = data.get('session_id')
+        
+        if not to_emails or not session_id:
+            return jsonify({'error': 'Missing required fields: to_emails, session_id'}), 400
+        
+        if not isinstance(to_emails, list):
+            return jsonify({'error': 'to_emails must be a list'}), 400
+        
+        if len(to_emails) > MAX_REPORT_RECIPIENTS:
+            return jsonify({'error': f'to_emails accepts at most {MAX_REPORT_RECIPIENTS} addresses'}), 400
+        
+        invalid = [
+            to_email for to_email in to_emails
+            if not isinstance(to_email, str) or not is_valid_email_format(to_email)
+        ]
+        if invalid:
+            return jsonify({'error': 'Invalid email addresses in to_emails', 'invalid': invalid}), 400
+        
+        if not db_manager:
+            return jsonify({'error': 'Database not initialized'}), 500
+        
+        to_emails = list(dict.fromkeys(to_emails))
+        report = _send_report(to_emails, session_id)
+        if report is None:
+            return jsonify({'error': 'Crawl session not found'}), 404
+        
+        sent = sum(1 for result in report['results'] if result.get('success'))
+        return jsonify({
+            'success': sent == len(to_emails),
+            'sent': sent,
+            'failed': len(to_emails) - sent,
+            'total_results': report['total_results'],
+            'results': [
+                {
+                    'to_email': to_email,
+                    'success': bool(result.get('success')),
+                    'message_id': result.get('message_id'),
+                    'error': result.get('error')
+                } for to_email, result in zip(to_emails, report['results'])
+            ]
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # SocketIO events
 @socketio.on('connect')
 def handle_connect():
@@ -449,7 +695,8 @@ if __name__ == '__main__':
         logger.info("🚀 Starting HackVeda Crawler Web Interface...")
         logger.info("📱 Dashboard will be available at: http://localhost:3000")
         
-        # Run the app
+        # Run the app; under gevent this is a cooperative server and
+        # allow_unsafe_werkzeug only matters for the threaded fallback
         socketio.run(app, 
                     host='0.0.0.0', 
                     port=3000, 